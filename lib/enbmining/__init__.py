@@ -1,3 +1,3 @@
 from .client import Client
 from .data import Interaction, Intervention
-from .scraper import InteractionScraper, InterventionScraper
+from .scraper import InteractionScraper, InterventionScraper, IssueScraper
@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import json
+import pickle
+import time
+from pathlib import Path
+
+from .utils import atomic_write
+
+# Modules whose code determines the data scraped from an issue.
+RULE_MODULES = [
+    'data.py',
+    'documents.py',
+    'entities.py',
+    'nlp.py',
+    'parsers.py',
+    'scraper.py',
+]
+
+
+class ResponseCache:
+
+    """An on-disk cache of HTTP responses, keyed by URL.
+
+    Each response is stored as two files named after the hash of its URL: the
+    body, and a JSON file with the URL, the validators (ETag and
+    Last-Modified) and the time at which it was fetched."""
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url):
+        """Returns the cached entry of a URL, or None if there is none.
+
+        The entry is a dict with the metadata and the `body` of the page."""
+        body_path, meta_path = self._paths(url)
+        if not body_path.exists() or not meta_path.exists():
+            return None
+        with meta_path.open(encoding='utf8') as f:
+            entry = json.load(f)
+        with body_path.open(encoding='utf8') as f:
+            entry['body'] = f.read()
+        return entry
+
+    def put(self, url, body, etag=None, last_modified=None):
+        body_path, _ = self._paths(url)
+        atomic_write(body_path, body)
+        self._write_meta(url, etag, last_modified)
+
+    def touch(self, url, entry):
+        """Marks a cached entry as fetched now (after a revalidation)."""
+        self._write_meta(url, entry['etag'], entry['last_modified'])
+
+    @staticmethod
+    def is_fresh(entry, max_age):
+        """Whether an entry can be used without revalidation.
+
+        An entry without a maximum age never expires."""
+        if max_age is None:
+            return True
+        return time.time() - entry['fetched_at'] < max_age
+
+    def _write_meta(self, url, etag, last_modified):
+        _, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+        }
+        atomic_write(meta_path, json.dumps(meta))
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf8')).hexdigest()
+        return self.folder / f'{key}.html', self.folder / f'{key}.json'
+
+
+class ScrapeCache:
+
+    """An on-disk cache of the data scraped from each issue.
+
+    The data of an issue are stored in a gzipped pickle named after the
+    issue id and a key, `<issue_id>.<key>.pkl.gz`. The key fingerprints
+    everything the data depend on: the row of the issue, its source (HTML or
+    tagged sentences) and a `context` shared by all issues, such as the lists
+    of entities and the version of the rules (see rules_version). Storing the
+    data of an issue removes its entries with other keys."""
+
+    def __init__(self, folder, context=''):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.context = context
+
+    def key(self, issue, source):
+        return fingerprint(
+            self.context, json.dumps(issue, sort_keys=True), source
+        )
+
+    def get(self, issue_id, key):
+        """Returns the cached data of an issue, or None if there are none for
+        this key."""
+        path = self._path(issue_id, key)
+        if not path.exists():
+            return None
+        with gzip.open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def put(self, issue_id, key, data):
+        path = self._path(issue_id, key)
+        content = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(path, gzip.compress(content))
+        for stale_path in self.folder.glob(f'{issue_id}.*.pkl.gz'):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+
+    def _path(self, issue_id, key):
+        return self.folder / f'{issue_id}.{key}.pkl.gz'
+
+
+def fingerprint(*parts):
+    """Hashes a sequence of strings or bytes."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf8')
+        # Hash each part separately, so that parts cannot run into each other.
+        digest.update(hashlib.sha1(part).digest())
+    return digest.hexdigest()
+
+
+def rules_version(modules=RULE_MODULES):
+    """Fingerprints the code of the modules that determine the scraped data
+    (see RULE_MODULES), so that changing a rule invalidates the cached data."""
+    folder = Path(__file__).parent
+    return fingerprint(*[(folder / name).read_bytes() for name in modules])
@@ -1,44 +1,196 @@
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+from .cache import ResponseCache
+from .metrics import FetchMetrics
+from .fetch import (
+    LISTING_MARKER,
+    LISTING_SELECTOR,
+    MEETING_MARKER,
+    MEETING_SELECTOR,
+    Fetcher,
+    RateLimiter,
+)
 
 BASE_URL = 'https://enb.iisd.org/'
 PAGE = 'page={number}'
 
 NEGOTIATIONS = {'UNFCCC': 'un-framework-convention-climate-change-unfccc/'}
 
+# ENB keeps adding coverage to a meeting page for some time after the end of
+# the meeting (e.g., the summary report).
+MEETING_GRACE_PERIOD = timedelta(days=30)
+
 
 class Client:
-    def __init__(self, negotiation='UNFCCC', debug=False):
+    def __init__(
+        self,
+        negotiation='UNFCCC',
+        debug=False,
+        browsers=1,
+        timeout=10,
+        workers=1,
+        min_interval=0.5,
+        cache_folder=None,
+        metrics_path=None,
+    ):
+        """Initializes a client for the ENB website.
+
+        With more than one worker, listing and meeting pages are crawled
+        concurrently, with at most `workers` requests in flight and at least
+        `min_interval` seconds between two requests to the ENB website.
+
+        With a cache folder, pages of closed meetings are fetched only once,
+        and listing pages are revalidated on every run (they are cached by
+        offset, and a new meeting shifts the meetings of every page).
+
+        With a metrics path, one JSON line is appended to it for every page
+        fetch (see FetchMetrics)."""
         self.negotiation = NEGOTIATIONS[negotiation]
         self.debug = debug
+        self.workers = workers
+        limiter = None
+        if workers > 1:
+            limiter = RateLimiter(workers, min_interval)
+        # HTTP session and warm browsers shared by all the page loads of this
+        # client.
+        cache = None
+        if cache_folder is not None:
+            cache = ResponseCache(cache_folder)
+        metrics = None
+        if metrics_path is not None:
+            metrics = FetchMetrics(metrics_path)
+        self.fetcher = Fetcher(
+            browsers=browsers,
+            timeout=timeout,
+            limiter=limiter,
+            cache=cache,
+            metrics=metrics,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.fetcher.close()
+
+    def get_issues_metadata(
+        self, start_page, end_page, missing_meetings=[], known_meetings=None
+    ):
+        """Scrapes the metadata of the issues of all meetings.
 
-    def get_issues_metadata(self, start_page, end_page, missing_meetings=[]):
+        Meetings are listed from the most recent one. If a set of known
+        meeting names or URLs is given, the scraping stops at the first known
+        meeting, so that only the new meetings are fetched."""
+        known_meetings = set() if known_meetings is None else known_meetings
+        missing_meetings = [
+            meeting
+            for meeting in missing_meetings
+            if not self._is_known(meeting, known_meetings)
+        ]
+        if self.workers > 1:
+            issues = self._crawl(
+                start_page, end_page, missing_meetings, known_meetings
+            )
+        else:
+            issues = self._crawl_serially(
+                start_page, end_page, missing_meetings, known_meetings
+            )
+        # Assign IDs in chronological orders (doesn't work with missing
+        # meetings)
+        issues = self._assign_ids(issues)
+        if self.debug:
+            self._print_fetch_report()
+        return issues
+
+    def _crawl_serially(
+        self, start_page, end_page, missing_meetings, known_meetings
+    ):
         issues = list()
         # Scrape issues from list of all meetings.
         for page_number in range(start_page - 1, end_page):  # Offset index.
             if self.debug:
                 print(f'Scraping page {page_number+1}...')
-            issues.extend(self._scrape_issues_from_meetings(page_number))
+            meetings = self._list_meetings(page_number)
+            new_meetings = self._until_known(meetings, known_meetings)
+            for meeting in new_meetings:
+                issues.extend(self._scrape_meeting(meeting))
+            # Stop paging as soon as we reach a known meeting.
+            if len(new_meetings) < len(meetings):
+                break
             time.sleep(1)
         # Scrape missing meetings.
         if self.debug and len(missing_meetings) > 0:
             print('Scraping missing meetings...')
         for meeting in missing_meetings:
-            issues.extend(self._scrape_missing_meeting(meeting))
-        # Assign IDs in chronological orders (doesn't work with missing
-        # meetings)
-        issues = self._assign_ids(issues)
+            issues.extend(self._scrape_meeting(meeting))
         return issues
 
-    def _scrape_missing_meeting(self, meeting):
+    def _crawl(self, start_page, end_page, missing_meetings, known_meetings):
+        """Crawls the listing and meeting pages concurrently.
+
+        The issues are returned in the same order as in the serial crawl."""
+        page_numbers = range(start_page - 1, end_page)  # Offset index.
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            if self.debug:
+                print(f'Scraping pages {start_page} to {end_page}...')
+            if len(known_meetings) > 0:
+                # List the pages one by one to stop at the first known meeting.
+                listings = map(self._list_meetings, page_numbers)
+            else:
+                listings = executor.map(self._list_meetings, page_numbers)
+            meetings = list()
+            for listing in listings:
+                new_meetings = self._until_known(listing, known_meetings)
+                meetings.extend(new_meetings)
+                if len(new_meetings) < len(listing):
+                    break
+            meetings.extend(missing_meetings)
+            if self.debug:
+                print(f'Scraping {len(meetings)} meetings...')
+            scraped = executor.map(self._scrape_meeting, meetings)
+            return [issue for issues in scraped for issue in issues]
+
+    @classmethod
+    def _until_known(cls, meetings, known_meetings):
+        """Returns the meetings listed before the first known one."""
+        for i, meeting in enumerate(meetings):
+            if cls._is_known(meeting, known_meetings):
+                return meetings[:i]
+        return meetings
+
+    @staticmethod
+    def _is_known(meeting, known_meetings):
+        return (
+            meeting['meeting'] in known_meetings
+            or meeting['url'] in known_meetings
+        )
+
+    def _print_fetch_report(self):
+        tiers = self.fetcher.tier_counts()
+        print(
+            f'Fetched {tiers["http"]} pages over HTTP and {tiers["browser"]}'
+            f' pages with a browser, revalidated {tiers["revalidated"]} and'
+            f' used {tiers["cache"]} pages from the cache'
+        )
+        timeouts = self.fetcher.drivers.timeouts
+        if len(timeouts) > 0:
+            print(f'{len(timeouts)} pages timed out:')
+            for url in timeouts:
+                print(f'  {url}')
+
+    def _scrape_meeting(self, meeting):
         issues = list()
-        issue_details = self._scrape_issues(meeting['url'])
+        max_age = None if self._is_closed(meeting['meeting_date']) else 0
+        issue_details = self._scrape_issues(meeting['url'], max_age)
         for issue in issue_details:
             issue |= {
                 'meeting': meeting['meeting'],
@@ -47,28 +199,29 @@ class Client:
             issues.append(issue)
         return issues
 
-    def _scrape_issues_from_meetings(self, page_number):
+    def _list_meetings(self, page_number):
         url = self._get_negotiation_url(page_number)
-        page = self._get_page(url)
-        return self._scrape_issues_metadata(BeautifulSoup(page, 'lxml'))
+        page = self._get_page(url, LISTING_SELECTOR, LISTING_MARKER, max_age=0)
+        return self._scrape_meetings_metadata(BeautifulSoup(page, 'lxml'))
 
-    def _scrape_issues_metadata(self, soup):
-        issues = list()
+    def _scrape_meetings_metadata(self, soup):
+        meetings = list()
         rows = soup.find_all(class_='views-row')
         for row in rows:
             heading = row.find('a', class_='c-list-item__heading-link')
-            meeting = heading.get_text()
             date = row.find('span', class_='c-list-item__meta-date')
-            date = date.get_text().replace('–', '-')
-            url = self._build_url(heading.get('href'))
-            issue_details = self._scrape_issues(url)
-            for issue in issue_details:
-                issue |= {'meeting': meeting, 'meeting_date': date}
-                issues.append(issue)
-        return issues
+            meetings.append(
+                {
+                    'meeting': heading.get_text(),
+                    'meeting_date': date.get_text().replace('–', '-'),
+                    'url': self._build_url(heading.get('href')),
+                }
+            )
+        return meetings
 
-    def _scrape_issues(self, url):
-        soup = BeautifulSoup(self._get_page(url), 'lxml')
+    def _scrape_issues(self, url, max_age=0):
+        page = self._get_page(url, MEETING_SELECTOR, MEETING_MARKER, max_age)
+        soup = BeautifulSoup(page, 'lxml')
         location = self._get_location(soup)
         coverage = soup.find('div', id='tab-by-date')
         issues = list()
@@ -96,26 +249,24 @@ class Client:
             return BASE_URL + href[1:]
         return BASE_URL + href
 
-    def _get_page(self, url):
-        # Use Selenium to fetch the page as a real browser
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36')
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    def _get_page(self, url, selector=None, marker=None, max_age=0):
+        # Try plain HTTP first, and use Selenium to fetch the page as a real
+        # browser if the markup is not there.
+        return self.fetcher.get(url, selector, marker, max_age)
+
+    @staticmethod
+    def _is_closed(meeting_date):
+        """Whether a meeting ended long enough ago for its page to be final.
+
+        The end date is the part after the dash, e.g., "13 June 2008" in
+        "2-13 June 2008". Meetings whose date cannot be parsed are considered
+        open."""
+        end_date = re.split(r'[-–]', meeting_date)[-1].strip()
         try:
-            driver.get(url)
-            # Wait for the page to load. Increase the sleep if needed.
-            import time
-            time.sleep(2)
-            page_source = driver.page_source
-        finally:
-            driver.quit()
-        return page_source
+            end_date = datetime.strptime(end_date, '%d %B %Y')
+        except ValueError:
+            return False
+        return end_date + MEETING_GRACE_PERIOD < datetime.now()
 
     def _get_location(self, soup):
         datevenue = soup.find('p', class_='c-banner__date-and-venue')
@@ -0,0 +1,130 @@
+import gzip
+import json
+import threading
+from pathlib import Path
+
+from .utils import atomic_write
+
+
+class HTMLCorpus:
+
+    """A compressed store of the HTML pages of ENB issues.
+
+    Each page is stored gzipped in its own file, `<issue_id>.html.gz`, which
+    gives random access by issue id. An index (`index.json`) records the raw
+    and compressed size of each page; it is only written by `flush`, which
+    also adds the pages missing from it, so the pages are listed from the
+    folder itself. Pages stored as loose `<issue_id>.html` files by earlier
+    versions are read transparently.
+
+    A trimmed version of a page, holding only its report, can be stored
+    alongside it as `<issue_id>.report.html.gz`."""
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.index_path = self.folder / 'index.json'
+        self._lock = threading.Lock()
+        self._index = None
+
+    def read(self, issue_id, prefer_report=False):
+        """Reads the page of an issue.
+
+        If `prefer_report` is set, reads the trimmed page when it exists."""
+        if prefer_report and self.has_report(issue_id):
+            path = self._path(issue_id, report=True)
+        else:
+            path = self._path(issue_id)
+        if path.exists():
+            with gzip.open(path, 'rt', encoding='utf8') as f:
+                return f.read()
+        with self._loose_path(issue_id).open(encoding='utf8') as f:
+            return f.read()
+
+    def write(self, issue_id, html, report=False):
+        """Writes the page of an issue, or its trimmed version."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        content = html.encode('utf8')
+        compressed = gzip.compress(content)
+        atomic_write(self._path(issue_id, report), compressed)
+        with self._lock:
+            self._add_sizes(issue_id, report, len(content), len(compressed))
+
+    def flush(self):
+        """Writes the index, adding the pages that are missing from it (such
+        as the ones written by a run that crashed)."""
+        with self._lock:
+            index = self._load_index()
+            for issue_id, report, path in self._compressed_pages():
+                prefix = 'report_' if report else ''
+                if f'{prefix}size' not in index.get(issue_id, dict()):
+                    # The last 4 bytes of a gzip file hold the raw size.
+                    with path.open('rb') as f:
+                        f.seek(-4, 2)
+                        size = int.from_bytes(f.read(4), 'little')
+                    self._add_sizes(issue_id, report, size, path.stat().st_size)
+            atomic_write(self.index_path, json.dumps(index).encode('utf8'))
+
+    def has_report(self, issue_id):
+        return self._path(issue_id, report=True).exists()
+
+    def __contains__(self, issue_id):
+        return (
+            self._path(issue_id).exists()
+            or self._loose_path(issue_id).exists()
+        )
+
+    def __iter__(self):
+        """Iterates over (issue_id, html) in the order of the issue ids."""
+        for issue_id in self.ids():
+            yield issue_id, self.read(issue_id)
+
+    def ids(self):
+        ids = {
+            issue_id
+            for issue_id, report, _ in self._compressed_pages()
+            if not report
+        }
+        ids |= {path.stem for path in self.folder.glob('*.html')}
+        return sorted(ids, key=int)
+
+    def pack(self, remove=True):
+        """Compresses the pages stored as loose HTML files."""
+        for path in sorted(self.folder.glob('*.html')):
+            with path.open(encoding='utf8') as f:
+                self.write(path.stem, f.read())
+            if remove:
+                path.unlink()
+        self.flush()
+
+    def _load_index(self):
+        if self._index is None:
+            if self.index_path.exists():
+                with self.index_path.open(encoding='utf8') as f:
+                    self._index = json.load(f)
+            else:
+                self._index = dict()
+        return self._index
+
+    def _add_sizes(self, issue_id, report, size, compressed_size):
+        prefix = 'report_' if report else ''
+        entry = self._load_index().setdefault(str(issue_id), dict())
+        entry[f'{prefix}size'] = size
+        entry[f'{prefix}compressed_size'] = compressed_size
+
+    def _compressed_pages(self):
+        """Yields the issue id, whether it is the trimmed page and the path
+        of each compressed page in the folder."""
+        for path in self.folder.glob('*.html.gz'):
+            name = path.name[: -len('.html.gz')]
+            if name.endswith('.report'):
+                yield name[: -len('.report')], True, path
+            else:
+                yield name, False, path
+
+    def _path(self, issue_id, report=False):
+        if report:
+            return self.folder / f'{issue_id}.report.html.gz'
+        return self.folder / f'{issue_id}.html.gz'
+
+    def _loose_path(self, issue_id):
+        return self.folder / f'{issue_id}.html'
@@ -1,6 +1,8 @@
+import csv
+import hashlib
+import json
 from abc import ABC
-
-from .utils import save_csv
+from pathlib import Path
 
 INTERACTION_TYPES = set(['on-behalf', 'agreement', 'support', 'opposition'])
 
@@ -8,19 +10,67 @@ INTERACTION_TYPES = set(['on-behalf', 'agreement', 'support', 'opposition'])
 class Data(ABC):
     @classmethod
     def to_csv(cls, data, path):
-        # Create dicts of datum.
-        dicts = [
-            {k: repr(getattr(datum, k)) for k in cls._keys} for datum in data
-        ]
-        # Add ID.
-        dicts = [d | {'id': i + 1} for i, d in enumerate(dicts)]
-        keys = ['id'] + cls._keys
-        save_csv(dicts, path, keys=keys)
+        with cls.writer(path) as writer:
+            writer.write(data)
+
+    @classmethod
+    def writer(cls, path, unique=False):
+        """Returns a DataWriter for this type of data."""
+        return DataWriter(cls, path, unique)
+
+
+class DataWriter:
+
+    """Writes data to a CSV file as it is produced, assigning ids on the fly.
+
+    With `unique`, a datum is dropped if a datum with the same values of
+    `_unique_keys` was already written. Only a digest of these values is
+    kept in memory, and the ids still count the dropped data, so that they
+    are the same as those of the full output."""
+
+    def __init__(self, Data, path, unique=False):
+        self.path = Path(path)
+        self.keys = Data._keys
+        self.unique_keys = Data._unique_keys if unique else None
+        self.total = 0
+        self.duplicates = 0
+        self._seen = set()
+
+    def __enter__(self):
+        self._file = self.path.open('w', newline='', encoding='utf8')
+        self._writer = csv.DictWriter(self._file, ['id'] + self.keys)
+        self._writer.writeheader()
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+        print(f'Saved CSV to {self.path}')
+
+    def write(self, data):
+        """Writes an iterable of data."""
+        for datum in data:
+            self.total += 1
+            row = {k: repr(getattr(datum, k)) for k in self.keys}
+            if self.unique_keys is not None:
+                key = json.dumps([row[k] for k in self.unique_keys])
+                digest = hashlib.sha1(key.encode('utf8')).digest()
+                if digest in self._seen:
+                    self.duplicates += 1
+                    continue
+                self._seen.add(digest)
+            self._writer.writerow({'id': self.total} | row)
+
+    @property
+    def written(self):
+        return self.total - self.duplicates
 
 
 class Intervention(Data):
 
     _keys = ['issue_id', 'entity', 'date', 'heading', 'sentence']
+    # An intervention is a duplicate of another one in the same sentence,
+    # even under another heading.
+    _unique_keys = ['issue_id', 'entity', 'date', 'sentence']
 
     def __init__(self, entity, sentence, issue, heading=None):
         self.entity = entity
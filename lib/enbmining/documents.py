@@ -0,0 +1,395 @@
+import re
+
+import lxml.etree
+import lxml.html
+from bs4 import BeautifulSoup, Tag
+
+REPORT_CLASS = 'o-content-from-editor--report'
+
+# Tags whose strings BeautifulSoup keeps apart: get_text() on a tag only
+# returns the strings whose closest enclosing tag among these is the same.
+STRING_CONTAINER_TAGS = frozenset(['script', 'style', 'template'])
+
+# Tags in which BeautifulSoup keeps whitespace as is.
+PREFORMATTED_TAGS = frozenset(['pre', 'textarea'])
+
+# BeautifulSoup turns strings made only of these characters into a single
+# space, or a single newline if they contain one.
+ASCII_SPACES = str.maketrans('', '', '\x20\x0a\x09\x0c\x0d')
+
+# Date of a meeting, like "2 - 12 June 1998", which starts the report of an
+# old page (see old_report_paragraphs).
+REPORT_DATE = re.compile(r'\d{1,2}\s*-\s*\d{1,2}\s+\w+\s+\d{4}')
+
+# Markers of the analysis and opinion sections, which end the report.
+OPINIONS = [
+    'BRIEF ANALYSIS OF',
+    'A Brief Analysis of',
+    'THINGS TO LOOK FOR',
+    'IN THE CORRIDORS',
+    'OTHER PRESS BRIEFINGS',
+    'KEEPING THE FOCUS ON PROGRESS',
+    # 'INTERSESSIONAL HIGHLIGHTS', # most of the intersessional highlights can also be deleted if we exclude the issue_type 'curtain-taiser'
+    # 'Intersessional Highlights',
+    'Where are we?',
+    'A Balanced Rulebook',
+    'Making the Concrete Abstract',
+    'The Expectations Gap',
+    'GLOSSARY',
+    'Ambition vs Reality',
+    'This issue of the Earth Negotiations Bulletin',
+]
+
+# All the markers in a single pattern, so that a text is scanned only once.
+OPINION = re.compile('|'.join(re.escape(opinion) for opinion in OPINIONS))
+
+
+class SoupDocument:
+
+    """An ENB page parsed with BeautifulSoup (and lxml)."""
+
+    def __init__(self, html):
+        self.soup = BeautifulSoup(html, 'lxml')
+
+    def paragraphs(self):
+        """Yields the name, the text and the texts of the heading tags (see
+        find_heading_tags) of each paragraph of the report."""
+        # Try to find modern HTML structure first
+        content = self.soup.find('section', class_=REPORT_CLASS)
+        if content is not None:
+            for paragraph, text in get_paragraphs(content):
+                found = find_heading_tags(paragraph)
+                headings = {name: tag.get_text() for name, tag in found.items()}
+                yield paragraph.name, text, headings
+            return
+
+        # If not found, extract the paragraphs from old HTML structure
+        paragraphs = self._find_paragraphs(self.soup)
+        for paragraph, text in old_report_paragraphs(paragraphs, Tag.get_text):
+            # The paragraphs of the report are separate paragraphs, even when
+            # nested in another one (as extract_old_html_content leaves them).
+            nested = nested_report_paragraphs(
+                self._find_paragraphs(paragraph), Tag.get_text
+            )
+            skipped = frozenset(id(node) for node in nested)
+            if skipped:
+                text = get_text(paragraph, skipped)
+            # We stop as soon as we see an opinion paragraph.
+            if is_opinion_text(text):
+                return
+            found = find_heading_tags(paragraph, skipped)
+            headings = {
+                name: get_text(tag, skipped) for name, tag in found.items()
+            }
+            yield paragraph.name, text, headings
+
+    @staticmethod
+    def _find_paragraphs(tag):
+        # Faster than tag.find_all('p'), and lazy.
+        return (node for node in tag.descendants if node.name == 'p')
+
+
+class LxmlDocument:
+
+    """An ENB page parsed with lxml.html only.
+
+    It yields the same paragraphs as a SoupDocument without building a
+    BeautifulSoup tree, which is about twice as fast."""
+
+    def __init__(self, html):
+        # Feed the HTML to the parser as BeautifulSoup does, which recovers
+        # from broken markup in the same way.
+        parser = lxml.html.HTMLParser()
+        try:
+            parser.feed(html)
+            # This is None if the page has no elements.
+            self.root = parser.close()
+        except lxml.etree.XMLSyntaxError:
+            # The page is empty.
+            self.root = None
+
+    def paragraphs(self):
+        """Yields the name, the text and the texts of the heading tags of
+        each paragraph of the report, as SoupDocument does."""
+        if self.root is None:
+            return
+        content = self._find_report()
+        if content is not None:
+            for node in content:
+                if not isinstance(node.tag, str):
+                    continue
+                text = self._text(node)
+                # We stop as soon as we see an opinion paragraph.
+                if is_opinion_text(text):
+                    return
+                if node.tag in ['p', 'h2', 'h3', 'h4']:
+                    yield node.tag, text, self._headings(node)
+            return
+        paragraphs = self.root.iter('p')
+        for node, text in old_report_paragraphs(paragraphs, self._text):
+            # Leave out the paragraphs of the report nested in this one, as
+            # SoupDocument does.
+            skipped = frozenset(
+                nested_report_paragraphs(node.iterdescendants('p'), self._text)
+            )
+            if skipped:
+                text = self._text(node, skipped)
+            if is_opinion_text(text):
+                return
+            yield node.tag, text, self._headings(node, skipped)
+
+    def _headings(self, paragraph, skipped=frozenset()):
+        found = self._find_heading_tags(paragraph, skipped)
+        return {name: self._text(tag, skipped) for name, tag in found.items()}
+
+    def _find_report(self):
+        for section in self.root.iter('section'):
+            if REPORT_CLASS in section.get('class', '').split():
+                return section
+        return None
+
+    @classmethod
+    def _text(cls, element, skipped=frozenset()):
+        """Concatenates the text of an element like BeautifulSoup's
+        get_text(), leaving out the subtrees of the `skipped` elements."""
+        kind = element.tag if element.tag in STRING_CONTAINER_TAGS else None
+        container = None
+        preformatted = False
+        for ancestor in element.iterancestors():
+            if container is None and ancestor.tag in STRING_CONTAINER_TAGS:
+                container = ancestor.tag
+            preformatted = preformatted or ancestor.tag in PREFORMATTED_TAGS
+        parts = list()
+        cls._collect_text(
+            element, skipped, parts, kind, container, preformatted
+        )
+        return ''.join(parts)
+
+    @classmethod
+    def _collect_text(
+        cls, element, skipped, parts, kind, container, preformatted
+    ):
+        # Comments and processing instructions have no text of their own.
+        if not isinstance(element.tag, str):
+            return
+        if element.tag in STRING_CONTAINER_TAGS:
+            container = element.tag
+        elif kind is None and container is not None:
+            return
+        preformatted = preformatted or element.tag in PREFORMATTED_TAGS
+        if element.text and container == kind:
+            parts.append(cls._string(element.text, preformatted))
+        for child in element:
+            if child not in skipped:
+                cls._collect_text(
+                    child, skipped, parts, kind, container, preformatted
+                )
+            if child.tail and container == kind:
+                parts.append(cls._string(child.tail, preformatted))
+
+    @staticmethod
+    def _string(text, preformatted):
+        """Returns a text node the way BeautifulSoup stores it."""
+        if preformatted or text.translate(ASCII_SPACES):
+            return text
+        return '\n' if '\n' in text else ' '
+
+    @staticmethod
+    def _find_heading_tags(paragraph, skipped):
+        """Finds the heading tags of a paragraph, as find_heading_tags
+        does."""
+        found = dict()
+        strongs = list()
+        strongs_with_em = set()
+        stack = list(reversed(paragraph))
+        while stack:
+            node = stack.pop()
+            if node in skipped or not isinstance(node.tag, str):
+                continue
+            stack.extend(reversed(node))
+            if node.tag in ('h2', 'h3', 'h4'):
+                found.setdefault(node.tag, node)
+            elif node.tag == 'strong':
+                strongs.append(node)
+            elif node.tag == 'em':
+                # Mark the enclosing <strong> tags as containing an <em>.
+                parent = node.getparent()
+                while parent is not paragraph:
+                    if parent.tag == 'strong':
+                        strongs_with_em.add(parent)
+                    parent = parent.getparent()
+        for strong in strongs:
+            key = 'strong_em' if strong in strongs_with_em else 'strong'
+            found.setdefault(key, strong)
+        return found
+
+
+# Parsers of HTML pages, by name.
+DOCUMENTS = {'bs4': SoupDocument, 'lxml': LxmlDocument}
+
+
+def find_heading_tags(paragraph, skipped=frozenset()):
+    """Finds the first <h2>, <h3> and <h4> tags, the first <strong> tag
+    containing an <em> tag ('strong_em') and the first one not containing
+    any ('strong') among the descendants of a paragraph.
+
+    The subtrees of the tags whose id is in `skipped` are left out."""
+    found = dict()
+    strongs = list()
+    strongs_with_em = set()
+    for node in descendants(paragraph, skipped):
+        if not isinstance(node, Tag):
+            continue
+        if node.name in ('h2', 'h3', 'h4'):
+            found.setdefault(node.name, node)
+        elif node.name == 'strong':
+            strongs.append(node)
+        elif node.name == 'em':
+            # Mark the enclosing <strong> tags as containing an <em>.
+            parent = node.parent
+            while parent is not paragraph:
+                if parent.name == 'strong':
+                    strongs_with_em.add(id(parent))
+                parent = parent.parent
+    for strong in strongs:
+        key = 'strong_em' if id(strong) in strongs_with_em else 'strong'
+        found.setdefault(key, strong)
+    return found
+
+
+def descendants(tag, skipped=frozenset()):
+    """Iterates over the descendants of a tag, leaving out the subtrees of
+    the tags whose id is in `skipped`."""
+    if not skipped:
+        return tag.descendants
+    return _descendants(tag, skipped)
+
+
+def _descendants(tag, skipped):
+    for child in tag.contents:
+        if id(child) in skipped:
+            continue
+        yield child
+        if isinstance(child, Tag):
+            yield from _descendants(child, skipped)
+
+
+def get_text(tag, skipped=frozenset()):
+    """Returns the text of a tag like Tag.get_text(), leaving out the
+    subtrees of the tags whose id is in `skipped`."""
+    if not skipped:
+        return tag.get_text()
+    types = tag.interesting_string_types
+    if isinstance(types, type):
+        types = (types,)
+    return ''.join(
+        node for node in _descendants(tag, skipped) if type(node) in types
+    )
+
+
+def old_report_paragraphs(paragraphs, get_text):
+    """Finds the paragraphs of the report in an old page, in a single pass.
+
+    The report starts at the first paragraph containing meeting title/date
+    info and ends before the next paragraph containing 'THINGS TO LOOK FOR'
+    or similar opinion sections. Without any title/date info, it starts at
+    the first paragraph.
+
+    Yields each paragraph of the report with its text (given by `get_text`)
+    as soon as it is found. Only the paragraphs before the first end marker
+    are kept until the start is found, in case there is none."""
+    paragraphs = iter(paragraphs)
+    before_end = list()
+    ended = False
+    for paragraph in paragraphs:
+        text = get_text(paragraph)
+        upper = text.upper()
+        # Look for patterns like "2 - 12 June 1998" or "MEETINGS OF THE SUBSIDIARY BODIES"
+        if (
+            REPORT_DATE.search(text)
+            or 'SUBSIDIARY BODIES' in upper
+            or 'FRAMEWORK CONVENTION' in upper
+        ):
+            # The report ends at the first end marker from its start.
+            while not is_report_end(upper):
+                yield paragraph, text
+                paragraph = next(paragraphs, None)
+                if paragraph is None:
+                    return
+                text = get_text(paragraph)
+                upper = text.upper()
+            return
+        if not ended:
+            ended = is_report_end(upper)
+            if not ended:
+                before_end.append((paragraph, text))
+    yield from before_end
+
+
+def nested_report_paragraphs(nested, get_text):
+    """Returns the paragraphs of the report nested in a paragraph of the
+    report, given all its nested paragraphs.
+
+    They are the nested paragraphs before the end of the report, since the
+    paragraphs following a paragraph of the report are the ones it
+    contains."""
+    report_nested = list()
+    for paragraph in nested:
+        if is_report_end(get_text(paragraph).upper()):
+            break
+        report_nested.append(paragraph)
+    return report_nested
+
+
+def is_report_end(upper):
+    """Whether an uppercased paragraph ends the report of an old page."""
+    return 'THINGS TO LOOK FOR' in upper or 'IN THE CORRIDORS' in upper
+
+
+def extract_old_html_content(soup):
+    """Extracts content from old HTML structure.
+
+    Moves the paragraphs of the report (see old_report_paragraphs) to a new
+    tag, which is returned, or returns None if the page has no paragraphs.
+    Use old_report_paragraphs to read them without modifying the soup.
+    """
+    # Find all paragraphs in the document
+    all_paragraphs = soup.find_all('p')
+
+    if not all_paragraphs:
+        return None
+
+    paragraphs = old_report_paragraphs(all_paragraphs, Tag.get_text)
+
+    # Create a wrapper div to contain the relevant paragraphs
+    wrapper = soup.new_tag('div')
+    for p, _ in list(paragraphs):
+        wrapper.append(p)
+
+    return wrapper
+
+
+def is_opinion_text(text):
+    return OPINION.search(text) is not None
+
+
+def get_paragraphs(content):
+    """Filters only the paragraphs that are relevant, as well as the standalone heading tags.
+
+    In particular, it removes analysis and opinion sections. Returns the
+    paragraphs with their text, which is extracted only once."""
+
+    if content is None:
+        return []
+
+    paragraphs = list()
+    for node in content.children:
+        if type(node) == Tag:
+            text = node.get_text()
+            # We stop as soon as we see an opinion paragraph.
+            if is_opinion_text(text):
+                return paragraphs
+            # Keep <p>, <h2>, <h3>, and <h4> tags.
+            elif node.name in ['p', 'h2', 'h3', 'h4']:
+                paragraphs.append((node, text))
+    return paragraphs
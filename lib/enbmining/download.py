@@ -0,0 +1,173 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .corpus import HTMLCorpus
+from .fetch import ISSUE_MARKER, ISSUE_SELECTOR
+from .scraper import extract_report
+from .utils import atomic_write
+
+PENDING = 'pending'
+OK = 'ok'
+FAILED = 'failed'
+
+
+def is_complete_issue(html):
+    """Tells whether the HTML of an issue is complete: either it holds the
+    report section, or it is a whole page, as the pages of the legacy layout
+    have no report section (their report is a range of paragraphs, see
+    documents.old_report_paragraphs)."""
+    return ISSUE_MARKER in html or '</html>' in html[-1000:].lower()
+
+
+class Downloader:
+
+    """A parallel, resumable downloader of ENB issues.
+
+    The state of each download (pending, ok or failed, with the number of
+    attempts) is persisted in a JSON file in the HTML folder, so that an
+    interrupted run can be restarted safely. Pages are stored in an
+    HTMLCorpus, which writes to a temporary file and then renames it, so a
+    page in the HTML folder is always complete.
+
+    With `trim`, the report of each page is also stored on its own (see
+    scraper.extract_report), so that scrapers parse much less HTML. A page
+    that cannot be trimmed is still downloaded; the error is kept in
+    `trim_errors`."""
+
+    def __init__(
+        self,
+        html_folder,
+        fetcher,
+        workers=4,
+        retries=3,
+        backoff=2,
+        trim=False,
+        debug=False,
+    ):
+        self.html_folder = Path(html_folder)
+        self.fetcher = fetcher
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.trim = trim
+        self.debug = debug
+        self.html_folder.mkdir(parents=True, exist_ok=True)
+        self.corpus = HTMLCorpus(html_folder)
+        self.state_path = self.html_folder / 'jobs.json'
+        self._lock = threading.Lock()
+        self.jobs = self._load_state()
+        self.trim_errors = dict()
+
+    def download(self, issues):
+        """Downloads all the issues that are not downloaded yet."""
+        todo = list()
+        for issue in issues:
+            job = self.jobs.setdefault(
+                issue['id'], {'status': PENDING, 'attempts': 0}
+            )
+            if job['status'] != OK or issue['id'] not in self.corpus:
+                job['status'] = PENDING
+                todo.append(issue)
+            elif self.trim and not self.corpus.has_report(issue['id']):
+                # Trim the pages downloaded before trimming was enabled.
+                self._trim(issue['id'])
+        self._save_state()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                # Consume the iterator to propagate unexpected exceptions.
+                list(executor.map(self._download, todo))
+        finally:
+            self.corpus.flush()
+        return self.summary()
+
+    def summary(self):
+        """Counts the jobs by status."""
+        counts = {PENDING: 0, OK: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job['status']] += 1
+        return counts
+
+    def failed(self):
+        return [
+            issue_id
+            for issue_id, job in self.jobs.items()
+            if job['status'] == FAILED
+        ]
+
+    def _download(self, issue):
+        job = self.jobs[issue['id']]
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                # Exponential backoff with jitter.
+                delay = self.backoff * 2 ** (attempt - 1)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+            if self.debug:
+                print(f'Downloading issue {issue["id"]}')
+            try:
+                html = self.fetcher.get(
+                    issue['url'],
+                    ISSUE_SELECTOR,
+                    is_complete_issue,
+                    attempt=attempt,
+                )
+                self.corpus.write(issue['id'], html)
+            except Exception as e:
+                with self._lock:
+                    job['attempts'] += 1
+                    job['error'] = repr(e)
+                if self.debug:
+                    print(f'Attempt {attempt+1} failed for issue {issue["id"]}')
+                continue
+            with self._lock:
+                job['attempts'] += 1
+                job['status'] = OK
+                job.pop('error', None)
+            self._save_state()
+            if self.trim:
+                self._trim(issue['id'], html)
+            return
+        with self._lock:
+            job['status'] = FAILED
+        self._save_state()
+
+    def _trim(self, issue_id, html=None):
+        try:
+            if html is None:
+                html = self.corpus.read(issue_id)
+            report = extract_report(html)
+            if report is not None:
+                self.corpus.write(issue_id, report, report=True)
+        except Exception as e:
+            with self._lock:
+                self.trim_errors[issue_id] = repr(e)
+            if self.debug:
+                print(f'Trimming failed for issue {issue_id}')
+
+    def _load_state(self):
+        if self.state_path.exists():
+            with self.state_path.open(encoding='utf8') as f:
+                return json.load(f)
+        # Adopt the complete pages downloaded before the job state existed;
+        # the others are left pending, and downloaded again.
+        return {
+            issue_id: {'status': OK, 'attempts': 1}
+            for issue_id in self.corpus.ids()
+            if self._is_complete(issue_id)
+        }
+
+    def _is_complete(self, issue_id):
+        """Tells whether a stored page is complete, as the pages written by
+        earlier versions could be cut short by a crash."""
+        try:
+            html = self.corpus.read(issue_id)
+        except (OSError, EOFError, ValueError):
+            return False
+        return is_complete_issue(html)
+
+    def _save_state(self):
+        with self._lock:
+            atomic_write(self.state_path, json.dumps(self.jobs, indent=1))
@@ -0,0 +1,338 @@
+import queue
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
+)
+
+# CSS selectors of the elements that signal that a page is rendered.
+LISTING_SELECTOR = 'a.c-list-item__heading-link'
+MEETING_SELECTOR = 'div#tab-by-date'
+# The pages of the legacy layout have no report section (nor any section), so
+# their first paragraph is waited for instead.
+ISSUE_SELECTOR = 'section.o-content-from-editor--report, body:not(:has(section)) p'
+
+# Markup that a page served over plain HTTP must contain to be usable.
+LISTING_MARKER = 'c-list-item__meta-date'
+MEETING_MARKER = 'o-accordion-item__heading-link'
+ISSUE_MARKER = 'o-content-from-editor--report'
+
+
+def chrome_options():
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return options
+
+
+class DriverPool:
+
+    """A bounded pool of warm headless Chrome instances.
+
+    Browsers are started lazily, at most `size` of them, and reused across
+    page loads. A browser that crashes during a page load is discarded and
+    replaced by a fresh one on the next request.
+
+    Instead of sleeping for a fixed time, a page load waits until an element
+    matching a CSS selector is present, or until `timeout` seconds have
+    passed. The URLs of the pages that hit the timeout are kept in
+    `timeouts`."""
+
+    def __init__(self, size=1, retries=1, timeout=10):
+        self.size = size
+        self.retries = retries
+        self.timeout = timeout
+        self.timeouts = list()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._driver_path = None
+
+    def get_page_source(self, url, selector=None, stats=None):
+        """Loads a URL in a pooled browser and returns the rendered HTML.
+
+        If a selector is given, waits until a matching element is present.
+        If a stats dict is given, the time spent waiting for the page to
+        render, whether the wait timed out and the number of retries are
+        added to it."""
+        stats = dict() if stats is None else stats
+        for attempt in range(self.retries + 1):
+            driver = self._acquire()
+            stats['timed_out'] = False
+            try:
+                driver.get(url)
+                if selector is not None:
+                    start = time.monotonic()
+                    stats['timed_out'] = not self._wait_for(driver, url, selector)
+                    stats['render_wait'] = time.monotonic() - start
+                page_source = driver.page_source
+            except Exception:
+                # The browser is probably dead (when chromedriver itself dies,
+                # selenium raises the errors of urllib3 as is): replace it and
+                # try again.
+                self._discard(driver)
+                if attempt == self.retries:
+                    raise
+                stats['retries'] = stats.get('retries', 0) + 1
+            else:
+                self._release(driver)
+                return page_source
+
+    def _wait_for(self, driver, url, selector):
+        """Waits for an element matching a selector, and returns False if
+        the timeout was hit."""
+        located = expected_conditions.presence_of_element_located(
+            (By.CSS_SELECTOR, selector)
+        )
+        try:
+            WebDriverWait(driver, self.timeout).until(located)
+        except TimeoutException:
+            # Keep whatever has been rendered so far, but report it.
+            self.timeouts.append(url)
+            return False
+        return True
+
+    def close(self):
+        """Quits all idle browsers."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+    def _acquire(self):
+        # At most `size` browsers are in use at any time.
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._spawn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, driver):
+        self._idle.put(driver)
+        self._slots.release()
+
+    def _discard(self, driver):
+        self._quit(driver)
+        self._slots.release()
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _spawn(self):
+        # Resolve the driver binary only once for the lifetime of the pool.
+        if self._driver_path is None:
+            self._driver_path = ChromeDriverManager().install()
+        return webdriver.Chrome(
+            service=Service(self._driver_path), options=chrome_options()
+        )
+
+
+class RateLimiter:
+
+    """A politeness limit shared by concurrent requests.
+
+    At most `max_in_flight` requests run at the same time, and two requests
+    to the same host start at least `min_interval` seconds apart."""
+
+    def __init__(self, max_in_flight=1, min_interval=0):
+        self.min_interval = min_interval
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._next_start = dict()
+
+    @contextmanager
+    def limit(self, url):
+        host = urlparse(url).netloc
+        with self._slots:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class Fetcher:
+
+    """A tiered fetcher for ENB pages.
+
+    A page is first requested over plain HTTP with a pooled, keep-alive
+    session. If the response does not contain the expected ENB markup, the
+    page is rendered in a headless browser instead. The tier that served
+    each URL ('http', 'browser', 'cache' or 'revalidated') is recorded in
+    `tiers`, and each fetch is recorded in the optional FetchMetrics.
+
+    An optional RateLimiter is applied to every request sent to ENB. With an
+    optional ResponseCache, a cached page is served as is while it is younger
+    than the `max_age` of the request, and revalidated with a conditional
+    request otherwise."""
+
+    def __init__(
+        self,
+        browsers=1,
+        timeout=10,
+        connections=10,
+        limiter=None,
+        cache=None,
+        metrics=None,
+    ):
+        self.timeout = timeout
+        self.limiter = limiter
+        self.cache = cache
+        self.metrics = metrics
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=connections, pool_maxsize=connections
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(
+            {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'}
+        )
+        self.drivers = DriverPool(size=browsers, timeout=timeout)
+        self.tiers = dict()
+
+    def get(self, url, selector=None, marker=None, max_age=None, attempt=0):
+        """Returns the HTML of a page.
+
+        The plain HTTP response is used only if it contains the marker, or,
+        if the marker is a function, if the marker returns True for it. The
+        attempt is the number of times the caller already tried this URL."""
+        stats = {
+            'retries': attempt,
+            'ttfb': None,
+            'render_wait': None,
+            'timed_out': False,
+        }
+        start, clock = time.time(), time.monotonic()
+        try:
+            html = self._get_with_cache(url, selector, marker, max_age, stats)
+        except Exception as e:
+            self._record(url, start, clock, stats, 'error', error=repr(e))
+            raise
+        status = 'timeout' if stats['timed_out'] else 'ok'
+        self._record(url, start, clock, stats, status, len(html.encode()))
+        return html
+
+    def _record(self, url, start, clock, stats, status, size=0, error=None):
+        if self.metrics is None:
+            return
+        self.metrics.record(
+            start=start,
+            url=url,
+            tier=self.tiers.get(url),
+            status=status,
+            bytes=size,
+            ttfb=stats['ttfb'],
+            render_wait=stats['render_wait'],
+            duration=time.monotonic() - clock,
+            retries=stats['retries'],
+            error=error,
+        )
+
+    def _get_with_cache(self, url, selector, marker, max_age, stats):
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None and self.cache.is_fresh(cached, max_age):
+                self.tiers[url] = 'cache'
+                return cached['body']
+        if self.limiter is None:
+            return self._get(url, selector, marker, cached, stats)
+        with self.limiter.limit(url):
+            return self._get(url, selector, marker, cached, stats)
+
+    def tier_counts(self):
+        return Counter(self.tiers.values())
+
+    def close(self):
+        self.session.close()
+        self.drivers.close()
+
+    def _get(self, url, selector, marker, cached, stats):
+        self.tiers.pop(url, None)
+        if marker is not None:
+            response = self._get_http(url, cached)
+            if response is not None:
+                stats['ttfb'] = response.elapsed.total_seconds()
+            if (
+                response is not None
+                and response.status_code == 304
+                and cached is not None
+            ):
+                # The cached page is still valid.
+                self.cache.touch(url, cached)
+                self.tiers[url] = 'revalidated'
+                return cached['body']
+            if (
+                response is not None
+                and response.status_code == 200
+                and self._is_usable(response.text, marker)
+            ):
+                self.tiers[url] = 'http'
+                self._store(
+                    url,
+                    response.text,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                )
+                return response.text
+        self.tiers[url] = 'browser'
+        html = self.drivers.get_page_source(url, selector, stats)
+        # Do not cache pages that might not be fully rendered.
+        if not stats['timed_out']:
+            self._store(url, html)
+        return html
+
+    @staticmethod
+    def _is_usable(html, marker):
+        if callable(marker):
+            return marker(html)
+        return marker in html
+
+    def _get_http(self, url, cached=None):
+        headers = dict()
+        if cached is not None:
+            if cached['etag'] is not None:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified'] is not None:
+                headers['If-Modified-Since'] = cached['last_modified']
+        try:
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+
+    def _store(self, url, html, etag=None, last_modified=None):
+        if self.cache is not None:
+            self.cache.put(url, html, etag, last_modified)
@@ -0,0 +1,77 @@
+import json
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+
+class FetchMetrics:
+
+    """Records one JSON line per page fetch.
+
+    Each record holds the run, the start time, the URL, the tier that served
+    the page, the final status, the number of bytes, the time to first byte
+    and the time spent waiting for the page to render (both in seconds, when
+    they apply), the total duration, the number of retries and the error, if
+    any."""
+
+    def __init__(self, path, run=None):
+        self.path = Path(path)
+        self.run = run if run is not None else datetime.now().isoformat()
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        line = json.dumps({'run': self.run} | fields)
+        with self._lock:
+            with self.path.open('a', encoding='utf8') as f:
+                print(line, file=f)
+
+
+def load_metrics(path):
+    with Path(path).open(encoding='utf8') as f:
+        return [json.loads(line) for line in f if line.strip() != '']
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of values (None if it is empty)."""
+    if len(values) == 0:
+        return None
+    values = sorted(values)
+    rank = max(0, int(round(q / 100 * len(values))) - 1)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(records):
+    """Summarizes fetch records by run.
+
+    Returns a dict mapping each run to its number of requests, throughput,
+    failure and timeout rates, count of pages per tier, and p50/p95 of the
+    duration and time to first byte."""
+    runs = defaultdict(list)
+    for record in records:
+        runs[record['run']].append(record)
+    summaries = dict()
+    for run, records in runs.items():
+        durations = [r['duration'] for r in records]
+        ttfbs = [r['ttfb'] for r in records if r.get('ttfb') is not None]
+        statuses = Counter(r['status'] for r in records)
+        # Wall-clock time of the run, from the first start to the last end.
+        start = min(r['start'] for r in records)
+        end = max(r['start'] + r['duration'] for r in records)
+        elapsed = max(end - start, 1e-9)
+        summaries[run] = {
+            'requests': len(records),
+            'pages_per_second': len(records) / elapsed,
+            'megabytes_per_second': sum(r['bytes'] for r in records)
+            / elapsed
+            / 1e6,
+            'failure_rate': statuses['error'] / len(records),
+            'timeout_rate': statuses['timeout'] / len(records),
+            'retries': sum(r['retries'] for r in records),
+            'tiers': dict(Counter(r['tier'] for r in records)),
+            'p50_duration': percentile(durations, 50),
+            'p95_duration': percentile(durations, 95),
+            'p50_ttfb': percentile(ttfbs, 50),
+            'p95_ttfb': percentile(ttfbs, 95),
+        }
+    return summaries
@@ -1,8 +1,11 @@
+import re
+from collections import OrderedDict
 from itertools import chain
 
 import nltk
 
 from .parsers import (
+    ENTITY,
     AgreementParser,
     OnBehalfParser,
     OppositionParser,
@@ -35,6 +38,22 @@ PARSERS = [
     AgreementParser,
 ]
 
+# Patterns of the word tokens that nltk.word_tokenize makes from double
+# quotes, which are the only tokens that are not found as is in the text.
+QUOTE_TOKENS = {'``': '(?:``|"|\'\')', "''": '(?:\'\'|")'}
+
+# The tagger of nltk.pos_tag, which builds a new one, and so loads its model,
+# on each call. It is loaded only once per process (see perceptron_tagger).
+_perceptron_tagger = None
+
+
+def perceptron_tagger():
+    """Returns the tagger of nltk.pos_tag, loaded once per process."""
+    global _perceptron_tagger
+    if _perceptron_tagger is None:
+        _perceptron_tagger = nltk.tag.PerceptronTagger()
+    return _perceptron_tagger
+
 
 class SentenceTokenizer:
 
@@ -88,10 +107,69 @@ class InteractionTokenizer:
         return self.tokenizer.tokenize(text)
 
 
+class TaggingMemo:
+
+    """A memo of the last tagged sentences of a POSTagger, which counts how
+    often a sentence is found in it."""
+
+    def __init__(self, maxsize):
+        """Initializes a memo that keeps at most `maxsize` sentences (none
+        if it is 0)."""
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sentence):
+        """Returns the tagged tokens of a sentence, or None if it is not in
+        the memo."""
+        tagged = self.entries.get(sentence)
+        if tagged is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(sentence)
+        return tagged
+
+    def put(self, sentence, tagged):
+        if not self.maxsize:
+            return
+        self.entries[sentence] = tuple(tagged)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __str__(self):
+        summary = memo_summary(self.hits, self.misses)
+        return f'{summary}, {len(self.entries)} sentences'
+
+
+def memo_summary(hits, misses):
+    """Describes the hits and misses of one or more TaggingMemo."""
+    lookups = hits + misses
+    hit_rate = hits / lookups if lookups else 0
+    return f'{hits} hits, {misses} misses ({hit_rate:.1%} hit rate)'
+
+
 class POSTagger:
-    def __init__(self, parties, groupings):
+    def __init__(self, parties, groupings, memo_size=2**12, mode='perceptron'):
+        """Initializes a tagger for the names of parties and groupings.
+
+        The tags of the last `memo_size` sentences are kept in a TaggingMemo,
+        so that repeated sentences are neither tokenized nor tagged again.
+        The memo is bound to the tagger, and so to its tagging model. It is
+        kept small (a few MB) as each process of a scrape has its own.
+
+        In the 'rules' mode, the tokens that are not in the tagging model get
+        cheap tags instead of those of the perceptron (see _tag_with_rules)."""
         self.tokenizer = InteractionTokenizer(parties, groupings)
+        self.tagger = perceptron_tagger()
         self._tag_model = self._init_model(parties, groupings)
+        self._tag_tokens = {
+            'perceptron': self._tag_with_perceptron,
+            'rules': self._tag_with_rules,
+        }[mode]
+        self.mode = mode
+        self.memo = TaggingMemo(memo_size)
 
     @staticmethod
     def _init_model(parties, groupings):
@@ -119,6 +197,152 @@ class POSTagger:
         # Assign new tags when they exist, otherwise default to current tag.
         return [(tok, self._tag_model.get(tok, tag)) for tok, tag in tagged]
 
+    def _tag_with_perceptron(self, tokens):
+        return self._retag_with_model(self.tagger.tag(tokens))
+
+    def _tag_with_rules(self, tokens):
+        """Tags tokens for the parsers, which only tell apart the tags of the
+        tagging model, punctuation and NNP (see parsers.CityChunker).
+
+        A token gets its tag in the tagging model, or else the tag of the
+        perceptron for words that always have the same one (punctuation and
+        frequent words), or else NNP if it is capitalized and NN otherwise.
+        If such a guessed tag comes right before a comma and a party, where
+        an NNP tag makes a city, the tokens are tagged by the perceptron."""
+        tagdict = self.tagger.tagdict
+        tagged = list()
+        guessed = list()
+        for token in tokens:
+            tag = self._tag_model.get(token) or tagdict.get(token)
+            guessed.append(tag is None)
+            if tag is None:
+                tag = 'NNP' if token[:1].isupper() else 'NN'
+            tagged.append((token, tag))
+        for i in range(len(tagged) - 2):
+            if guessed[i] and tagged[i + 1][1] == ',' and tagged[i + 2][1] == 'PAR':
+                return self._tag_with_perceptron(tokens)
+        return tagged
+
     def tag(self, sentence):
-        tagged = nltk.pos_tag(self.tokenizer.tokenize(sentence))
-        return self._retag_with_model(tagged)
+        tagged = self.memo.get(sentence)
+        if tagged is None:
+            tagged = self._tag_tokens(self.tokenizer.tokenize(sentence))
+            self.memo.put(sentence, tagged)
+        return list(tagged)
+
+    def tag_sents(self, sentences):
+        """Tags a batch of sentences, such as all the sentences of an issue."""
+        return [self.tag(sentence) for sentence in sentences]
+
+
+class EntityFilter:
+
+    """A filter of the sentences that cannot mention any entity, and so need
+    not be tagged.
+
+    A sentence gets an entity tag (see parsers.ENTITY) only if it has a word
+    token, or a sequence of word tokens merged by the WordTokenizer, that is
+    an entity in the tagging model of the POSTagger. The tokens of
+    nltk.word_tokenize are found as is in the text, in order and separated by
+    whitespace only (except for double quotes, see QUOTE_TOKENS), so a single
+    regex of these sequences of tokens matches every sentence that can get an
+    entity tag: the filter has no false negatives."""
+
+    def __init__(self, parties, groupings, model):
+        """Initializes the filter from the names of parties and groupings,
+        and the tagging model of their POSTagger."""
+        markers = [mk for parser in PARSERS for mk in parser.markers]
+        trie = dict()
+        for name in chain(parties, groupings, markers):
+            tokens = nltk.word_tokenize(name)
+            token = '_'.join(tokens)
+            if model.get(token) not in ENTITY:
+                continue
+            # The tokens of the name, merged by the WordTokenizer...
+            units = list()
+            for i, part in enumerate(tokens):
+                if i > 0:
+                    units.append(r'\s*')
+                if part in QUOTE_TOKENS:
+                    units.append(QUOTE_TOKENS[part])
+                else:
+                    units.extend(map(re.escape, part))
+            self._add(trie, units)
+            # ...or found as a single token.
+            self._add(trie, list(map(re.escape, token)))
+        self.regex = re.compile(self._pattern(trie) if trie else '(?!)')
+        self.checked = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _add(trie, units):
+        for unit in units:
+            trie = trie.setdefault(unit, dict())
+        trie[None] = None
+
+    @classmethod
+    def _pattern(cls, trie):
+        """Returns a regex of the sequences of units of a trie, whose common
+        prefixes are matched only once."""
+        # A sequence that ends here matches, whatever follows.
+        if None in trie:
+            return ''
+        alternatives = [
+            unit + cls._pattern(child) for unit, child in sorted(trie.items())
+        ]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return f'(?:{"|".join(alternatives)})'
+
+    def may_mention(self, sentence):
+        """Returns False if a sentence, as it is tagged, cannot mention any
+        entity."""
+        self.checked += 1
+        if self.regex.search(sentence) is None:
+            self.skipped += 1
+            return False
+        return True
+
+    def __str__(self):
+        fraction = self.skipped / self.checked if self.checked else 0
+        return (
+            f'{self.skipped} of {self.checked} sentences skipped ({fraction:.1%})'
+        )
+
+
+class NLPContext:
+
+    """The sentence tokenizer, the POS tagger and the EntityFilter for a set
+    of entities.
+
+    They are costly to build (the tagger tokenizes the names of all the
+    entities and markers), so a context is meant to be built once and given
+    to all the scrapers of a process (see shared)."""
+
+    # The contexts shared in this process, by names of entities and mode of
+    # tagger.
+    _shared = dict()
+
+    def __init__(self, parties, groupings, tagger='perceptron'):
+        """Initializes the context from lists of Party and Grouping, with a
+        POSTagger in the given mode."""
+        self.sentence_tokenizer = SentenceTokenizer()
+        names = (
+            [party.name for party in parties],
+            [group.name for group in groupings],
+        )
+        self.pos_tagger = POSTagger(*names, mode=tagger)
+        self.entity_filter = EntityFilter(*names, self.pos_tagger._tag_model)
+
+    @classmethod
+    def shared(cls, parties, groupings, tagger='perceptron'):
+        """Returns the context of this process for a set of entities and a
+        mode of tagger, which is built on first use."""
+        key = (
+            tuple(party.name for party in parties),
+            tuple(group.name for group in groupings),
+            tagger,
+        )
+        if key not in cls._shared:
+            cls._shared[key] = cls(parties, groupings, tagger)
+        return cls._shared[key]
@@ -0,0 +1,162 @@
+from multiprocessing import Pool
+from pathlib import Path
+
+from .cache import ScrapeCache, fingerprint, rules_version
+from .entities import Grouping, Party
+from .nlp import NLPContext
+from .sentences import SentenceCorpus
+from .utils import load_html
+
+# State of the current process, set once by _init_worker.
+_worker = dict()
+
+
+def scrape_issues(
+    Scraper,
+    issues,
+    html_folder,
+    parties_path,
+    groupings_path,
+    sentences_folder=None,
+    workers=1,
+    parser='bs4',
+    cache_folder=None,
+    tagger='perceptron',
+    stats=None,
+):
+    """Scrapes the issues with a Scraper class, in a pool of processes if
+    `workers` is more than one.
+
+    Yields the list of data scraped from each issue, in the order of the
+    issues, so the output is the same whatever the number of workers. Each
+    process loads the entities and builds its NLP context at most once. The
+    HTML pages are parsed with `parser` (see documents.DOCUMENTS) and their
+    sentences are tagged by a POSTagger in the `tagger` mode.
+
+    With a cache folder, the data of an issue are served from a ScrapeCache
+    as long as neither the issue, its source, the lists of entities nor the
+    rules changed, and only the other issues are scraped.
+
+    If a stats dict is given, the hits and misses of the tagging memos of
+    all processes (see nlp.TaggingMemo) are added to it."""
+    initargs = (
+        Scraper,
+        html_folder,
+        parties_path,
+        groupings_path,
+        sentences_folder,
+        parser,
+        cache_folder,
+        tagger,
+    )
+    stats = dict() if stats is None else stats
+    stats.update(memo_hits=0, memo_misses=0)
+    if workers == 1:
+        _init_worker(*initargs)
+        results = map(_scrape_issue, issues)
+        yield from _collect(results, stats)
+        return
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        results = pool.imap(_scrape_issue, issues)
+        yield from _collect(results, stats)
+
+
+def _collect(results, stats):
+    for data, (hits, misses) in results:
+        stats['memo_hits'] += hits
+        stats['memo_misses'] += misses
+        yield data
+
+
+def _init_worker(
+    Scraper,
+    html_folder,
+    parties_path,
+    groupings_path,
+    sentences_folder,
+    parser,
+    cache_folder,
+    tagger,
+):
+    parties = Party.load(parties_path)
+    groupings = Grouping.load(groupings_path)
+    sentences = None
+    if sentences_folder is not None:
+        sentences = SentenceCorpus(
+            sentences_folder, parties, groupings, parser, tagger
+        )
+    cache = None
+    if cache_folder is not None:
+        context = fingerprint(
+            rules_version(),
+            Scraper.__name__,
+            parser,
+            tagger,
+            Path(parties_path).read_bytes(),
+            Path(groupings_path).read_bytes(),
+        )
+        cache = ScrapeCache(Path(cache_folder) / Scraper.__name__, context)
+    _worker.update(
+        Scraper=Scraper,
+        html_folder=html_folder,
+        parties=parties,
+        groupings=groupings,
+        sentences=sentences,
+        # Set by _scrape for the first issue that is tagged.
+        nlp=None,
+        parser=parser,
+        cache=cache,
+        tagger=tagger,
+    )
+
+
+def _scrape_issue(issue):
+    """Returns the data scraped from an issue, and the hits and misses of the
+    tagging memo while scraping it."""
+    before = _memo_counts()
+    cache = _worker['cache']
+    if cache is None:
+        data = _scrape(issue)
+    else:
+        key = cache.key(issue, _source(issue))
+        data = cache.get(issue['id'], key)
+        if data is None:
+            data = _scrape(issue)
+            cache.put(issue['id'], key, data)
+    after = _memo_counts()
+    return data, (after[0] - before[0], after[1] - before[1])
+
+
+def _scrape(issue):
+    sentences = _worker['sentences']
+    nlp = None
+    if sentences is None or issue['id'] not in sentences:
+        nlp = _worker['nlp'] = NLPContext.shared(
+            _worker['parties'], _worker['groupings'], _worker['tagger']
+        )
+    scraper = _worker['Scraper'].load(
+        _worker['html_folder'],
+        issue,
+        _worker['parties'],
+        _worker['groupings'],
+        sentences,
+        nlp,
+        _worker['parser'],
+    )
+    return list(scraper.scrape())
+
+
+def _memo_counts():
+    if _worker['nlp'] is None:
+        return 0, 0
+    memo = _worker['nlp'].pos_tagger.memo
+    return memo.hits, memo.misses
+
+
+def _source(issue):
+    """Returns what the data of an issue are scraped from: its stored tagged
+    sentences if any (see Scraper.load), or else its HTML."""
+    sentences = _worker['sentences']
+    if sentences is not None and issue['id'] in sentences:
+        return sentences.read_raw(issue['id'])
+    return load_html(_worker['html_folder'], issue['id'])
@@ -41,8 +41,10 @@ class InterventionParser(Parser):
         tagged_sentence = self._preprocess(tagged_sentence, Processors)
         # Collapse the 'on-behalf' interactions.
         tagged_sentence = OnBehalfParser.collapse(tagged_sentence)
+        # Keep each entity once, in the order of the sentence (the order of a
+        # set would depend on the hash seed of the process).
         return self._to_interventions(
-            set(
+            dict.fromkeys(
                 [
                     self._token2entity[token]
                     for token, tag in tagged_sentence
@@ -1,8 +1,13 @@
 import re
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 
-from .nlp import POSTagger, SentenceTokenizer
+from .documents import (
+    DOCUMENTS,
+    REPORT_CLASS,
+    extract_old_html_content,
+)
+from .nlp import NLPContext
 from .parsers import (
     AgreementParser,
     InterventionParser,
@@ -11,7 +16,7 @@ from .parsers import (
     SupportParser,
     WhileOppositionParser,
 )
-from .utils import flatten
+from .utils import load_html
 
 INTERACTION_PARSERS = [
     OnBehalfParser,
@@ -21,419 +26,399 @@ INTERACTION_PARSERS = [
     AgreementParser,
 ]
 
+# Levels of headings, from the highest to the lowest: <h2>, <h3> and <h4> tags,
+# <strong> tags containing an <em> tag, <strong> tags, additional headings
+# (see ADDITIONAL_HEADINGS) and subheadings (text before a colon).
+HEADING_LEVELS = ['h2', 'h3', 'h4', 'strong_em', 'strong', 'h5', 'subheading']
+# Order of the levels in the full heading of a paragraph.
+HEADING_ORDER = [0, 1, 2, 3, 5, 4, 6]
+
+# Headings that have specific text in their own paragraph, but are not tagged
+# as <h2> or <h3>.
+ADDITIONAL_HEADINGS = frozenset(
+    [
+        'SBI',
+        'SBI PLENARY',
+        'SBI CONTACT GROUPS',
+        'SBSTA',
+        'SBSTA PLENARY',
+        'SBSTA CONTACT GROUPS',
+        'JOINT SBI/SBSTA',
+        'COP',
+        'COP PLENARY',
+        'COP CONTACT GROUPS',
+        'HIGH-LEVEL SEGMENT',
+        'INFORMAL HIGH-LEVEL PLENARY',
+        'INFORMAL HIGH-LEVEL PLENARY MORNING SESSION',
+        'INFORMAL HIGH-LEVEL PLENARY NIGHT SESSION',
+        'INFORMAL HIGH-LEVEL PLENARY & CONSULTATIONS',
+        'CONTACT GROUP',
+        'CONTACT GROUPS',
+        'CONTACT GROUPS AND INFORMAL CONSULTATIONS',
+        'INFORMAL GROUPS',
+        'INFORMAL MEETINGS',
+        'INFORMAL CONSULTATIONS',
+        'INFORMAL GROUPS AND CONSULTATIONS',
+        'INFORMAL MEETINGS AND CONTACT GROUPS',
+        'NEGOTIATING GROUPS',
+        'NEGOTIATING GROUPS AND INFORMAL CONSULTATIONS',
+        'PLENARY',
+        'OPENING PLENARY',
+        'LATE NIGHT PLENARY',
+        'CLOSING PLENARY',
+        'ROUND TABLE',
+        'ROUND TABLES',
+        'PRESIDENTS GROUP',
+        'MAIN NEGOTIATING GROUP',
+        'INFORMAL DRAFTING GROUP ON CDM TECHNICAL ISSUES',
+        'JOINT WORKING GROUP ON COMPLIANCE',
+        'WELCOMING CEREMONY',
+        'SPECIAL SESSION ON LULUCF AND THE CDM',
+        'NOTE BY THE PRESIDENT OF COP-6',
+    ]
+)
+
+SUBHEADING = re.compile(r'^[^.,]*?:')
+LEADING_COLON = re.compile(r'^\s*:?')
+
+# Rewrites of the text of a paragraph before it is split into sentences. The
+# stages are applied in order; the (pattern, replacement) rules of a stage
+# never overlap, so each stage is applied in a single pass (see
+# compile_rules).
+NORMALIZE_RULES = [
+    [
+        # Rename a.m./p.m. as am/pm.
+        (r'a\.m\.', 'am'),
+        (r'p\.m\.', 'pm'),
+        # Rename 'Amb.' as 'Amb'.
+        (r'Amb\.', 'Amb'),
+    ],
+    # Insert a space after each match.
+    [
+        # Add spacing for "andParty" -> "and Party".
+        (r'and(?=[A-Z])', r'\g<0> '),
+        (r'77(?=and)', r'\g<0> '),
+        # Add spacing between specific party names and "by" or "and" or a
+        # given verb.
+        (r'[A-Z][A-Z](?=and|said)', r'\g<0> '),
+        (r'by(?=[A-Z])', r'\g<0> '),
+        (r'AUSTRALIA(?=endorsed|said)', r'\g<0> '),
+        (r'Australia(?=said)', r'\g<0> '),
+        (r'EU(?=highlighted)', r'\g<0> '),
+        # Add spacing after dot.
+        (r'\.(?=[A-Z])', r'\g<0> '),
+    ],
+    [
+        # Add spacing before parenthesis.
+        (r'\((?<=\w\()', ' ('),
+    ],
+    [
+        # Normalize spaces: carriage returns, line breaks and non-breaking
+        # spaces become spaces, and runs of spaces a single one.
+        (r'\s\s+|[\r\n\xa0]', ' '),
+    ],
+]
+
+# Rewrites of a sentence before it gets tagged, in a single stage.
+PREPROCESS_RULES = [
+    [
+        # Remove exclamation marks from names (for sentence tokenizer).
+        (r'Climate Justice Now!', 'Climate Justice Now'),
+        (r'CLIMATE JUSTICE NOW!', 'CLIMATE JUSTICE NOW'),
+        (r'CJN!', 'CJN'),
+        (r'ACT!', 'ACT'),
+        # Normalize US$ to prevent parsing interventions for US.
+        (r'US\$', '$'),
+        # Normalize QELROS so that it's not matched as a city.
+        (r'QELRO[Ss]', 'qelros'),
+    ],
+]
+
+
+def compile_rules(rules):
+    """Compiles a stage of (pattern, replacement) rules into a single regex
+    and a replacement for its `sub` method.
+
+    The patterns are tried in order at each position of the text, so a match
+    of one rule must not hide a match of another. The alternation has no
+    capturing groups, which would keep the regex engine from skipping to the
+    possible first characters of a match; when the replacements differ, the
+    rule of each match is found again (matches are rare)."""
+    regex = re.compile('|'.join(f'(?:{pattern})' for pattern, _ in rules))
+    if len({replacement for _, replacement in rules}) == 1:
+        return regex, rules[0][1]
+    compiled = [(re.compile(pattern), repl) for pattern, repl in rules]
+
+    def replace(match):
+        for rule, replacement in compiled:
+            rule_match = rule.match(match.string, match.start())
+            if rule_match is not None:
+                return rule_match.expand(replacement)
+
+    return regex, replace
+
+
+NORMALIZE = [compile_rules(rules) for rules in NORMALIZE_RULES]
+PREPROCESS = [compile_rules(rules) for rules in PREPROCESS_RULES]
+
+
+def extract_report(html):
+    """Extracts the report of an ENB page as a standalone document.
+
+    The document holds only the report section of the page (or, for old
+    pages, the range of paragraphs of the report, wrapped in a report
+    section), so that a Scraper finds the same content in it as in the full
+    page. Returns None if the page has no report."""
+    soup = BeautifulSoup(html, 'lxml')
+    content = soup.find('section', class_=REPORT_CLASS)
+    if content is None:
+        content = extract_old_html_content(soup)
+        if content is None:
+            return None
+        content.name = 'section'
+        content['class'] = REPORT_CLASS
+    return str(content)
+
 
 class Scraper:
 
     """A general scraper for interventions and interactions."""
 
-    def __init__(self, html, issue, parties, groupings):
+    def __init__(
+        self,
+        html,
+        issue,
+        parties,
+        groupings,
+        tagged_sentences=None,
+        nlp=None,
+        parser='bs4',
+    ):
         """Initializes the scraper with some HTML, metadata about the ENB
-        issue, and a set of Entities."""
-        self.soup = BeautifulSoup(html, 'lxml')
+        issue, and a set of Entities.
+
+        The HTML can be None if the tagged sentences of the issue are given
+        instead (see sentences.SentenceCorpus). The sentences are tokenized
+        and tagged with an NLPContext for the entities, by default the one
+        shared in the process. The HTML is parsed with the given parser (see
+        documents.DOCUMENTS)."""
+        self.document = None
+        if html is not None:
+            self.document = DOCUMENTS[parser](html)
         self.issue = issue
         self.parties = parties
         self.groupings = groupings
-        self.pos_tagger = POSTagger(
-            [party.name for party in parties],
-            [group.name for group in groupings],
-        )
+        self.tagged_sentences = tagged_sentences
+        self.nlp = nlp
+        if tagged_sentences is None and nlp is None:
+            self.nlp = NLPContext.shared(parties, groupings)
+
+    @classmethod
+    def load(
+        cls,
+        html_folder,
+        issue,
+        parties,
+        groupings,
+        sentences=None,
+        nlp=None,
+        parser='bs4',
+    ):
+        """Creates a scraper for an issue from its tagged sentences if they
+        are stored in `sentences` (a SentenceCorpus), or else from its HTML."""
+        if sentences is not None and issue['id'] in sentences:
+            tagged_sentences = sentences.read(issue['id'])
+            return cls(None, issue, parties, groupings, tagged_sentences)
+        html = load_html(html_folder, issue['id'])
+        return cls(html, issue, parties, groupings, nlp=nlp, parser=parser)
 
     def scrape(self):
-        # Scraped interventions/interactions (list of list).
-        headsentences = self.extract_sentences()
-        scraped = [
-            self._scrape_from_sentence(sentence, heading)
-            for heading, sentences in headsentences.items()
-            for sentence in sentences
+        """Yields the scraped interventions/interactions, as they are found."""
+        for heading, sentence, tagged in self.tag_sentences():
+            yield from self._scrape_tagged(sentence, heading, tagged)
+
+    def tag_sentences(self):
+        """Extracts the sentences of the issue and tags them.
+
+        The sentences that cannot mention any entity, and so have nothing to
+        scrape, are left out when the issue is tagged from its HTML.
+
+        Yields (heading, sentence, tagged sentence)."""
+        if self.tagged_sentences is not None:
+            yield from self.tagged_sentences
+            return
+        sentences = self.tag_paragraph_sentences(skip_entity_free=True)
+        for _, heading, sentence, tagged in sentences:
+            yield heading, sentence, tagged
+
+    def tag_paragraph_sentences(self, skip_entity_free=False):
+        """Extracts the sentences of the issue and tags them, keeping the
+        index of their paragraph.
+
+        With `skip_entity_free`, the sentences that cannot mention any entity
+        (see nlp.EntityFilter) are left out without being tagged.
+
+        Yields (paragraph, heading, sentence, tagged sentence)."""
+        tokenizer = self.nlp.sentence_tokenizer
+        sentences = [
+            (paragraph, heading, sentence, self._preprocess(sentence))
+            for paragraph, heading, text in self._headed_paragraphs()
+            for sentence in tokenizer.tokenize(text)
         ]
-        # Flatten this nested list.
-        return flatten(scraped)
+        if skip_entity_free:
+            may_mention = self.nlp.entity_filter.may_mention
+            sentences = [s for s in sentences if may_mention(s[3])]
+        # Tag all the sentences of the issue in one batch.
+        tagged_sentences = self.nlp.pos_tagger.tag_sents(
+            [preprocessed for _, _, _, preprocessed in sentences]
+        )
+        for (paragraph, heading, sentence, _), tagged in zip(
+            sentences, tagged_sentences
+        ):
+            yield paragraph, heading, sentence, tagged
+
+    def _scrape_from_sentence(self, sentence, heading):
+        tagged = self.nlp.pos_tagger.tag(self._preprocess(sentence))
+        return self._scrape_tagged(sentence, heading, tagged)
+
+    def _interventions(self, sentence, heading, tagged):
+        """Extracts a list of interventions from a tagged sentence."""
+        parser = InterventionParser(
+            sentence, self.issue, self.parties, self.groupings, heading
+        )
+        return parser.parse(tagged)
+
+    def _interactions(self, sentence, heading, tagged):
+        """Extracts a list of interactions from a tagged sentence."""
+        interactions = list()
+        for Parser in INTERACTION_PARSERS:
+            parser = Parser(sentence, self.issue, self.parties, self.groupings, heading)
+            interactions.extend(parser.parse(tagged))
+        return interactions
 
     # The following function extracts a dictionary of headings-subheadings and sentences,
     # while keeping the current heading and/or subheading until a new one is found.
     def extract_sentences(self):
-        # Try to find modern HTML structure first
-        content = self.soup.find('section', class_='o-content-from-editor--report')
-        
-        # If not found, try to extract from old HTML structure
-        if content is None:
-            content = self._extract_old_html_content()
-        
-        paragraphs = self._get_paragraphs(content)
-        tokenizer = SentenceTokenizer()
+        tokenizer = self.nlp.sentence_tokenizer
         headsentences = dict()
-        current_heading2 = None  # Variable to keep track of the current heading level 2
-        current_heading3 = None  # Variable to keep track of the current heading level 3
-        current_heading4 = None  # Variable to keep track of the current heading level 4
-        current_strong_em = None  # Variable to keep track of the current strong_em
-        current_strong = None  # Variable to keep track of the current strong
-        current_heading5 = None  # Variable to keep track of the additional headings
-        current_subheading = None  # Variable to keep track of the current subheading
-
-        for i, paragraph in enumerate(paragraphs):
-            if not isinstance(paragraph, Tag):
-                continue  # Skip if the paragraph is not a Tag object
-            text = paragraph.get_text()
-            text = self._normalize(text)
-
-            # Check for <h2> tags at the correct level
-            if paragraph.name in ['h2']:
-                current_heading2 = paragraph.get_text().strip().rstrip(':').strip()
-                current_heading3 = None   # Reset current_heading3 when a new heading is found
-                current_heading4 = None  # Reset current_heading4 when a new heading is found
-                current_strong_em = None  # Reset strong_em when a new heading is found
-                current_strong = None  # Reset strong when a new heading is found
-                current_heading5 = None  # Reset current_heading5 when a new heading is found
-                current_subheading = None  # Reset subheading when a new heading is found
-                
-                # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                if re.match(rf'^{re.escape(current_heading2)}(:|\s|$)', text):
-                    text = text[len(current_heading2):].strip()
-            else:
-                heading = paragraph.find(['h2'])  # Find heading tagged as <h2> within the paragraph
-                if heading:
-                    current_heading2 = heading.get_text().strip().rstrip(':').strip()
-                    current_heading3 = None   # Reset current_heading3 when a new heading is found
-                    current_heading4 = None  # Reset current_heading4 when a new heading is found
-                    current_strong_em = None  # Reset strong_em when a new heading is found
-                    current_strong = None  # Reset strong when a new heading is found
-                    current_heading5 = None  # Reset current_heading4 when a new heading is found
-                    current_subheading = None  # Reset subheading when a new heading is found
-
-                    # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                    if re.match(rf'^{re.escape(current_heading2)}(:|\s|$)', text):
-                        text = text[len(current_heading2):].strip()
-
-            # Check for <h3> tags at the correct level
-            if paragraph.name in ['h3']:
-                current_heading3 = paragraph.get_text().strip().rstrip(':').strip()
-                current_heading4 = None  # Reset current_heading4 when a new heading is found
-                current_strong_em = None  # Reset strong_em when a new heading is found
-                current_strong = None  # Reset strong when a new heading is found
-                current_heading5 = None  # Reset current_heading5 when a new heading is found
-                current_subheading = None  # Reset subheading when a new heading is found
-                
-                # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                if re.match(rf'^{re.escape(current_heading3)}(:|\s|$)', text):
-                    text = text[len(current_heading3):].strip()
-            else:
-                heading = paragraph.find(['h3'])  # Find heading tagged as <h3> within the paragraph
-                if heading:
-                    current_heading3 = heading.get_text().strip().rstrip(':').strip()
-                    current_heading4 = None  # Reset current_heading4 when a new heading is found
-                    current_strong_em = None  # Reset strong_em when a new heading is found
-                    current_strong = None  # Reset strong when a new heading is found
-                    current_heading5 = None  # Reset current_heading5 when a new heading is found
-                    current_subheading = None  # Reset subheading when a new heading is found
-
-                    # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                    if re.match(rf'^{re.escape(current_heading3)}(:|\s|$)', text):
-                        text = text[len(current_heading3):].strip()
-
-            # Check for <h4> tags at the correct level
-            if paragraph.name in ['h4']:
-                current_heading4 = paragraph.get_text().strip().rstrip(':').strip()
-                current_strong_em = None  # Reset strong_em when a new heading is found
-                current_strong = None  # Reset strong when a new heading is found
-                current_heading5 = None  # Reset current_heading5 when a new heading is found
-                current_subheading = None  # Reset subheading when a new heading is found
-                
+        for _, heading_full, text in self._headed_paragraphs():
+            # Tokenize the cleaned text into sentences
+            headsentences[heading_full] = tokenizer.tokenize(text)  # Match the heading to the sentences
+        return headsentences
+
+    def _headed_paragraphs(self):
+        """Yields the index, the full heading and the cleaned text of each
+        paragraph.
+
+        The current headings are kept in a stack of levels (see
+        HEADING_LEVELS): finding a heading at some level resets all the
+        levels below it."""
+        headings = [None] * len(HEADING_LEVELS)
+
+        paragraphs = self.document.paragraphs()
+        for i, (tag_name, raw_text, found) in enumerate(paragraphs):
+            text = self._normalize(raw_text)
+
+            # `found` has the texts of the heading tags among the descendants
+            # of the paragraph (see documents.find_heading_tags).
+            for level, name in enumerate(HEADING_LEVELS[:-1]):
+                if name == 'h5':
+                    if not self._additional_heading(raw_text):
+                        continue
+                    heading = self._clean_heading(raw_text)
+                elif name in ('h2', 'h3', 'h4') and name == tag_name:
+                    # The paragraph is itself a heading at the correct level.
+                    heading = self._clean_heading(raw_text)
+                elif name in found:
+                    heading = self._clean_heading(found[name])
+                else:
+                    continue
+                headings[level] = heading
+                # Reset the lower levels when a new heading is found
+                headings[level + 1 :] = [None] * (len(headings) - level - 1)
                 # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                if re.match(rf'^{re.escape(current_heading4)}(:|\s|$)', text):
-                    text = text[len(current_heading4):].strip()
-            else:
-                heading = paragraph.find(['h4'])  # Find heading tagged as <h4> within the paragraph
-                if heading:
-                    current_heading4 = heading.get_text().strip().rstrip(':').strip()
-                    current_strong_em = None  # Reset strong_em when a new heading is found
-                    current_strong = None  # Reset strong when a new heading is found
-                    current_heading5 = None  # Reset current_heading5 when a new heading is found
-                    current_subheading = None  # Reset subheading when a new heading is found
-
-                    # Remove the heading from the text ONLY if it is at the beginning or followed by a colon
-                    if re.match(rf'^{re.escape(current_heading4)}(:|\s|$)', text):
-                        text = text[len(current_heading4):].strip()
-                    
-            strong_em = next((tag for tag in paragraph.find_all(lambda tag: tag.name == 'strong' and tag.find('em'))), None)  # Find <strong> tag containing <em> tag
-            if strong_em:
-                current_strong_em = strong_em.get_text().strip().rstrip(':').strip()
-                current_strong = None  # Reset strong when a new strong_em is found
-                current_heading5 = None  # Reset current_heading5 when a new heading is found
-                current_subheading = None  # Reset subheading when a new strong_em is found
-                
-                # Remove the strong_em from the text ONLY if it is at the beginning, followed by a colon, or follows a heading
-                if re.match(rf'^{re.escape(current_strong_em)}(:|\s|$)', text):
-                    text = text[len(current_strong_em):].strip()
-            
-            strong = next((tag for tag in paragraph.find_all(lambda tag: tag.name == 'strong' and not tag.find('em'))), None)  # Find <strong> tag not containing <em> tag
-            if strong:
-                current_strong = strong.get_text().strip().rstrip(':').strip()
-                current_heading5 = None  # Reset current_heading5 when a new heading is found
-                current_subheading = None  # Reset subheading when a new strong is found
-                
-                # Remove the strong from the text ONLY if it is at the beginning, followed by a colon, or follows a heading
-                if re.match(rf'^{re.escape(current_strong)}(:|\s|$)', text):
-                    text = text[len(current_strong):].strip()
-
-            additional_heading = self._additional_heading(paragraph)
-            if additional_heading:
-                current_heading5 = paragraph.get_text().strip().rstrip(':').strip()
-                current_subheading = None  # Reset subheading when a new strong is found
-
-                # Remove the current_heading5 from the text ONLY if it is at the beginning, followed by a colon, or follows a heading
-                if re.match(rf'^{re.escape(current_heading5)}(:|\s|$)', text):
-                    text = text[len(current_heading5):].strip()
-             
+                text = self._remove_heading(heading, text)
+
             # Check for subheading at the beginning of the paragraph, finishing with a colon but before any full sentence and before any comma
-            subheading_match = re.match(r'^[^.,]*?:', text)
+            subheading_match = SUBHEADING.match(text)
             if subheading_match:
-                current_subheading = subheading_match.group(0).strip().rstrip(':').strip()  # Extract the subheading and remove any leading or trailing space and trailing colon
+                headings[-1] = subheading_match.group(0).strip().rstrip(':').strip()  # Extract the subheading and remove any leading or trailing space and trailing colon
                 # Do not remove the subheading from the text, because sometimes relevant parts of sentences are captured in the subheading (e.g.: 'The EU said, inter alia: ')
-            
+
             # Concatenate heading, strong_em, strong, and subheading into heading_full with slashes as separators
             unique_components = list(dict.fromkeys(filter(None, [
-                current_heading2,
-                current_heading3,
-                current_heading4,
-                current_strong_em,
-                current_heading5,
-                current_strong,
-                current_subheading
+                headings[level] for level in HEADING_ORDER
             ])))
             heading_full = ' / '.join(unique_components)
-            
+
             if heading_full:
                 heading_full = f'Paragraph {i+1}: {heading_full}'  # Prepend the paragraph index to the heading
             else:
                 heading_full = f'Paragraph {i+1}'  # Use the paragraph index as the default heading
 
             # Remove any leading spaces and colons from the text
-            text = re.sub(r'^\s*:?', '', text).strip()
-
-            # Tokenize the cleaned text into sentences
-            sentences = tokenizer.tokenize(text)
-            headsentences[heading_full] = sentences  # Match the heading to the sentences
-
-        return headsentences
-
-    def _extract_old_html_content(self):
-        """Extracts content from old HTML structure.
-        
-        Finds all text between the start marker (first occurrence of a paragraph 
-        containing meeting title/date info) and the end marker (paragraph containing 
-        'THINGS TO LOOK FOR' or similar opinion sections).
-        """
-        # Find all paragraphs in the document
-        all_paragraphs = self.soup.find_all('p')
-        
-        if not all_paragraphs:
-            return None
-        
-        # Find the start index - look for paragraph after the header info
-        # This typically contains date and meeting information
-        start_idx = 0
-        for i, p in enumerate(all_paragraphs):
-            text = p.get_text().strip()
-            # Look for patterns like "2 - 12 June 1998" or "MEETINGS OF THE SUBSIDIARY BODIES"
-            if re.search(r'\d{1,2}\s*-\s*\d{1,2}\s+\w+\s+\d{4}', text) or \
-               'SUBSIDIARY BODIES' in text.upper() or \
-               'FRAMEWORK CONVENTION' in text.upper():
-                start_idx = i
-                break
-        
-        # Find the end index - look for "THINGS TO LOOK FOR" or similar opinion sections
-        end_idx = len(all_paragraphs)
-        for i in range(start_idx, len(all_paragraphs)):
-            text = all_paragraphs[i].get_text().strip()
-            if 'THINGS TO LOOK FOR' in text.upper() or 'IN THE CORRIDORS' in text.upper():
-                end_idx = i
-                break
-        
-        # Create a wrapper div to contain the relevant paragraphs
-        from bs4 import Tag
-        wrapper = self.soup.new_tag('div')
-        for p in all_paragraphs[start_idx:end_idx]:
-            wrapper.append(p)
-        
-        return wrapper
+            text = LEADING_COLON.sub('', text).strip()
+            yield i + 1, heading_full, text
 
     @staticmethod
-    def _get_paragraphs(content):
-        """Filters only the paragraphs that are relevant, as well as the standalone heading tags.
-
-        In particular, it removes analysis and opinion sections."""
-
-        def is_opinion_paragraph(node):
-            text = node.get_text()
-            opinions = [
-                'BRIEF ANALYSIS OF',
-                'A Brief Analysis of',
-                'THINGS TO LOOK FOR',
-                'IN THE CORRIDORS',
-                'OTHER PRESS BRIEFINGS',
-                'KEEPING THE FOCUS ON PROGRESS',
-                # 'INTERSESSIONAL HIGHLIGHTS', # most of the intersessional highlights can also be deleted if we exclude the issue_type 'curtain-taiser'
-                # 'Intersessional Highlights',
-                'Where are we?',
-                'A Balanced Rulebook',
-                'Making the Concrete Abstract',
-                'The Expectations Gap',
-                'GLOSSARY',
-                'Ambition vs Reality',
-                'This issue of the Earth Negotiations Bulletin',
-            ]
-            return any([opinion in text for opinion in opinions])
+    def _clean_heading(text):
+        return text.strip().rstrip(':').strip()
 
-        if content is None:
-            return []
-        
-        paragraphs = list()
-        for node in content.children:
-            if type(node) == Tag:
-                # We stop as soon as we see an opinion paragraph.
-                if is_opinion_paragraph(node):
-                    return paragraphs
-                # Keep <p>, <h2>, <h3>, and <h4> tags.
-                elif node.name in ['p', 'h2', 'h3', 'h4']:
-                    paragraphs.append(node)
-        return paragraphs
+    @staticmethod
+    def _remove_heading(heading, text):
+        """Removes a heading from the text if it is at the beginning, followed
+        by a colon, a space or nothing."""
+        if not text.startswith(heading):
+            return text
+        rest = text[len(heading):]
+        if rest == '' or rest[0] == ':' or rest[0].isspace():
+            return rest.strip()
+        return text
 
     def _normalize(self, text):
         """Normalizes a sentence before it gets tokenized.
 
-        This improves the format of the sentence, so it can be saved as is."""
-        # Rename a.m./p.m. as am/pm.
-        text = re.sub(r'a\.m\.', r'am', text)
-        text = re.sub(r'p\.m\.', r'pm', text)
-        # Rename 'Amb.' as 'Amb'.
-        text = re.sub(r'Amb\.', r'Amb', text)
-        # Add spacing for "andParty" -> "and Party".
-        text = re.sub(r'(and)([A-Z])', r'\1 \2', text)
-        text = re.sub(r'77and', r'77 and', text)
-        # Add spacing between specific party names and "by" or "and" or a given verb.
-        text = re.sub(r'([A-Z][A-Z])(and)', r'\1 \2', text)
-        text = re.sub(r'([A-Z][A-Z])(said)', r'\1 \2', text)
-        text = re.sub(r'(by)([A-Z])', r'\1 \2', text)
-        text = re.sub(r'(AUSTRALIA)(endorsed)', r'\1 \2', text)
-        text = re.sub(r'(AUSTRALIA)(said)', r'\1 \2', text)
-        text = re.sub(r'(Australia)(said)', r'\1 \2', text)
-        text = re.sub(r'(EU)(highlighted)', r'\1 \2', text)
-        # Add spacing before parenthesis.
-        text = re.sub(r'(\w)\(', r'\1 (', text)
-        # Add spacing before dot.
-        text = re.sub(r'\.([A-Z])', r'. \1', text)
-        # Normalize spaces.
-        text = re.sub(r'\r', ' ', text)
-        text = re.sub(r'\n', ' ', text)
-        text = re.sub(r'\xa0+', ' ', text, flags=re.UNICODE)
-        text = re.sub(r'\s\s+', ' ', text)
+        This improves the format of the sentence, so it can be saved as is
+        (see NORMALIZE_RULES)."""
+        for regex, replacement in NORMALIZE:
+            text = regex.sub(replacement, text)
         return text
 
     def _preprocess(self, text):
         """Prepocesses a sentence before it gets tagged.
 
-        This changes the sentence, so it should not be saved in this format."""
-        # Remove exclamation marks from names (for sentence tokenizer).
-        text = re.sub(r'(Climate Justice Now)!', r'\1', text)
-        text = re.sub(r'(CLIMATE JUSTICE NOW)!', r'\1', text)
-        text = re.sub(r'(CJN)!', r'\1', text)
-        text = re.sub(r'(ACT)!', r'\1', text)
-        # Normalize US$ to prevent parsing interventions for US.
-        text = re.sub(r'US\$', '$', text)
-        # Normalize QELROS so that it's not matched as a city.
-        text = re.sub(r'QELRO[Ss]', 'qelros', text)
+        This changes the sentence, so it should not be saved in this format
+        (see PREPROCESS_RULES)."""
+        for regex, replacement in PREPROCESS:
+            text = regex.sub(replacement, text)
         return text
 
     # Identify additional headings that have specific text in their own paragraph, but are not tagged as <h2> or <h3>
-    def _additional_heading(self, node):
-        text = node.get_text().strip()
-        headings = [
-            'SBI',
-            'SBI PLENARY',
-            'SBI CONTACT GROUPS',
-            'SBSTA',
-            'SBSTA PLENARY',
-            'SBSTA CONTACT GROUPS',
-            'JOINT SBI/SBSTA',
-            'COP',
-            'COP PLENARY',
-            'COP CONTACT GROUPS',
-            'HIGH-LEVEL SEGMENT',
-            'INFORMAL HIGH-LEVEL PLENARY',
-            'INFORMAL HIGH-LEVEL PLENARY MORNING SESSION',
-            'INFORMAL HIGH-LEVEL PLENARY NIGHT SESSION',
-            'INFORMAL HIGH-LEVEL PLENARY & CONSULTATIONS',
-            'CONTACT GROUP',
-            'CONTACT GROUPS',
-            'CONTACT GROUPS AND INFORMAL CONSULTATIONS',
-            'INFORMAL GROUPS',
-            'INFORMAL MEETINGS',
-            'INFORMAL CONSULTATIONS',
-            'INFORMAL GROUPS AND CONSULTATIONS',
-            'INFORMAL MEETINGS AND CONTACT GROUPS',
-            'NEGOTIATING GROUPS',
-            'NEGOTIATING GROUPS AND INFORMAL CONSULTATIONS',
-            'PLENARY',
-            'OPENING PLENARY',
-            'LATE NIGHT PLENARY',
-            'CLOSING PLENARY',
-            'ROUND TABLE',
-            'ROUND TABLES',
-            'PRESIDENTS GROUP',
-            'MAIN NEGOTIATING GROUP',
-            'INFORMAL DRAFTING GROUP ON CDM TECHNICAL ISSUES',
-            'JOINT WORKING GROUP ON COMPLIANCE',
-            'WELCOMING CEREMONY',
-            'SPECIAL SESSION ON LULUCF AND THE CDM',
-            'NOTE BY THE PRESIDENT OF COP-6',
-            ]
-        return text in headings
+    @staticmethod
+    def _additional_heading(text):
+        return text.strip() in ADDITIONAL_HEADINGS
 
 
 class InterventionScraper(Scraper):
-    def __init__(self, html, issue, parties, groupings):
-        super().__init__(html, issue, parties, groupings)
+    def _scrape_tagged(self, sentence, heading, tagged):
+        return self._interventions(sentence, heading, tagged)
 
-    def scrape(self):
-        # Scraped interventions/interactions (list of list).
-        headsentences = self.extract_sentences()
-        scraped = [
-            self._scrape_from_sentence(sentence, heading)
-            for heading, sentences in headsentences.items()
-            for sentence in sentences
-        ]
-        # Flatten this nested list.
-        return flatten(scraped)
 
-    def _scrape_from_sentence(self, sentence, heading):
-        """Extracts a list of interventions from a sentence."""
-        parser = InterventionParser(
-            sentence, self.issue, self.parties, self.groupings, heading
-        )
-        tagged = self.pos_tagger.tag(self._preprocess(sentence))
-        return parser.parse(tagged)
+class InteractionScraper(Scraper):
+    def _scrape_tagged(self, sentence, heading, tagged):
+        return self._interactions(sentence, heading, tagged)
 
 
-class InteractionScraper(Scraper):
-    def __init__(self, html, issue, parties, groupings):
-        super().__init__(html, issue, parties, groupings)
+class IssueScraper(Scraper):
 
-    def scrape(self):
-        # Scraped interventions/interactions (list of list).
-        headsentences = self.extract_sentences()
-        scraped = [
-            self._scrape_from_sentence(sentence, heading)
-            for heading, sentences in headsentences.items()
-            for sentence in sentences
-        ]
-        # Flatten this nested list.
-        return flatten(scraped)
+    """A scraper for both interventions and interactions, which parses the
+    HTML, splits and tags the sentences only once per issue."""
 
-    def _scrape_from_sentence(self, sentence, heading):
-        """Extracts a list of interactions from a sentence."""
-        tagged = self.pos_tagger.tag(self._preprocess(sentence))
-        interactions = list()
-        for Parser in INTERACTION_PARSERS:
-            parser = Parser(sentence, self.issue, self.parties, self.groupings, heading)
-            interactions.extend(parser.parse(tagged))
-        return interactions
+    def scrape(self):
+        """Yields the lists of interventions and of interactions of each
+        sentence."""
+        for heading, sentence, tagged in self.tag_sentences():
+            yield (
+                self._interventions(sentence, heading, tagged),
+                self._interactions(sentence, heading, tagged),
+            )
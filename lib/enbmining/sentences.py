@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import json
+import pickle
+import threading
+from pathlib import Path
+
+from .cache import fingerprint, rules_version
+from .nlp import PARSERS
+from .utils import atomic_write
+
+COLUMNS = ['issue_id', 'paragraph', 'heading', 'sentence', 'tokens', 'tags']
+
+# Modules whose code determines the stored sentences and their tags. The
+# parsers only matter through their markers, which get their own tags, so
+# that the corpus can be kept while changing the parsing rules.
+TAGGING_MODULES = ['documents.py', 'entities.py', 'nlp.py', 'scraper.py']
+
+
+class SentenceCorpus:
+
+    """A store of the tagged sentences of ENB issues.
+
+    The sentences of each issue are stored column by column in their own
+    gzipped pickle, `<issue_id>.pkl.gz`: the issue id, the index of the
+    paragraph, the full heading, the normalized sentence, and its tokens and
+    their tags. The parsers can then run on the stored sentences without
+    parsing the HTML or tagging the sentences again.
+
+    The sentences and their tags depend on the parties and groupings, on the
+    code that extracts and tags them, on the HTML parser and on the mode of
+    the tagger. The corpus records them (`meta.json`: a fingerprint of the
+    names of the entities, a version of the rules, the parser and the mode)
+    and refuses to be used with different ones."""
+
+    def __init__(
+        self, folder, parties, groupings, parser='bs4', tagger='perceptron'
+    ):
+        self.folder = Path(folder)
+        self.meta_path = self.folder / 'meta.json'
+        self.fingerprint = self._fingerprint(parties, groupings)
+        self.meta = {
+            'entities': self.fingerprint,
+            'rules': self._rules_version(),
+            'parser': parser,
+            'tagger': tagger,
+        }
+        self._lock = threading.Lock()
+        self._checked = False
+
+    def read(self, issue_id):
+        """Reads the tagged sentences of an issue.
+
+        Returns a list of the (heading, sentence, tagged sentence) yielded by
+        Scraper.tag_sentences."""
+        self._check()
+        with gzip.open(self._path(issue_id), 'rb') as f:
+            columns = pickle.load(f)
+        return [
+            (heading, sentence, list(zip(tokens, tags)))
+            for heading, sentence, tokens, tags in zip(
+                columns['heading'],
+                columns['sentence'],
+                columns['tokens'],
+                columns['tags'],
+            )
+        ]
+
+    def write(self, issue_id, tagged_sentences):
+        """Writes the tagged sentences of an issue, as yielded by
+        Scraper.tag_paragraph_sentences."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if not self.meta_path.exists():
+                atomic_write(self.meta_path, json.dumps(self.meta).encode('utf8'))
+        self._check()
+        columns = {column: list() for column in COLUMNS}
+        for paragraph, heading, sentence, tagged in tagged_sentences:
+            columns['issue_id'].append(int(issue_id))
+            columns['paragraph'].append(paragraph)
+            columns['heading'].append(heading)
+            columns['sentence'].append(sentence)
+            columns['tokens'].append([token for token, _ in tagged])
+            columns['tags'].append([tag for _, tag in tagged])
+        content = pickle.dumps(columns, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(self._path(issue_id), gzip.compress(content))
+
+    def read_raw(self, issue_id):
+        """Reads the file of an issue, as stored."""
+        self._check()
+        return self._path(issue_id).read_bytes()
+
+    def __contains__(self, issue_id):
+        return self._path(issue_id).exists()
+
+    def ids(self):
+        return sorted(
+            (path.name.split('.')[0] for path in self.folder.glob('*.pkl.gz')),
+            key=int,
+        )
+
+    def clear(self):
+        """Removes all the stored sentences, so that the corpus is rebuilt."""
+        for path in self.folder.glob('*.pkl.gz'):
+            path.unlink()
+        self.meta_path.unlink(missing_ok=True)
+        self._checked = False
+
+    def _check(self):
+        if self._checked or not self.meta_path.exists():
+            return
+        with self.meta_path.open(encoding='utf8') as f:
+            meta = json.load(f)
+        differences = {
+            'entities': 'other parties or groupings',
+            'rules': 'another version of the rules',
+            'parser': 'another parser',
+            'tagger': 'another mode of tagger',
+        }
+        for key, difference in differences.items():
+            if meta.get(key) != self.meta[key]:
+                raise ValueError(
+                    f'The sentences in {self.folder} were tagged with '
+                    f'{difference}; rebuild the corpus'
+                )
+        self._checked = True
+
+    @staticmethod
+    def _fingerprint(parties, groupings):
+        names = sorted(f'PAR {party.name}' for party in parties)
+        names += sorted(f'GRP {group.name}' for group in groupings)
+        return hashlib.sha1('\n'.join(names).encode('utf8')).hexdigest()
+
+    @staticmethod
+    def _rules_version():
+        markers = [marker for parser in PARSERS for marker in parser.markers]
+        return fingerprint(
+            rules_version(TAGGING_MODULES), json.dumps(markers).encode('utf8')
+        )
+
+    def _path(self, issue_id):
+        return self.folder / f'{issue_id}.pkl.gz'
@@ -1,4 +1,6 @@
 import csv
+import os
+import threading
 from itertools import chain
 from pathlib import Path
 
@@ -26,11 +28,12 @@ def load_csv(path):
         ]
 
 
-def load_html(html_folder, issue_id):
-    html_folder = Path(html_folder)
-    path = html_folder / Path(str(issue_id)).with_suffix('.html')
-    with path.open(encoding="utf8") as f:
-        return f.read()
+def load_html(html_folder, issue_id, prefer_report=True):
+    """Loads the HTML of an issue, preferring its trimmed report if any."""
+    # Imported here, as the corpus itself writes with atomic_write.
+    from .corpus import HTMLCorpus
+
+    return HTMLCorpus(html_folder).read(issue_id, prefer_report)
 
 
 def print_progress(index, array, every_n=None):
@@ -47,3 +50,21 @@ def combine(array1, array2):
 
 def flatten(iterable):
     return list(chain.from_iterable(iterable))
+
+
+def atomic_write(path, content):
+    """Writes some content (str or bytes) to a file.
+
+    The content is written to a temporary file first, which then replaces
+    the file, so that an interrupted run never leaves a truncated file
+    behind. The temporary file is unique to the process and thread, so
+    concurrent writers of the same file do not mix their contents."""
+    if isinstance(content, str):
+        content = content.encode('utf8')
+    path = Path(path)
+    tmp_path = path.with_name(
+        f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp'
+    )
+    with tmp_path.open('wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
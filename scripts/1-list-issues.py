@@ -18,11 +18,20 @@ missing_meetings = [
 ]
 
 
-def main(output_path, debug=False):
-    client = Client(negotiation='UNFCCC', debug=debug)
-    issues = client.get_issues_metadata(
-        start_page=1, end_page=9, missing_meetings=missing_meetings
+def main(
+    output_path, workers=1, cache_folder=None, metrics_path=None, debug=False
+):
+    client = Client(
+        negotiation='UNFCCC',
+        debug=debug,
+        workers=workers,
+        cache_folder=cache_folder,
+        metrics_path=metrics_path,
     )
+    with client:
+        issues = client.get_issues_metadata(
+            start_page=1, end_page=9, missing_meetings=missing_meetings
+        )
     save_csv(issues, output_path, sort_keys=True)
 
 
@@ -1,19 +1,11 @@
 import csv
-import os
-import random
-import time
 from pathlib import Path
 
 import fire
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-
-def log(issue, response, html_folder):
-    with open(str(html_folder / Path('log.txt')), 'a+') as f:
-        print(f'Status {response.status_code} for issue {issue["id"]}', file=f)
+from enbmining.corpus import HTMLCorpus
+from enbmining.download import Downloader
+from enbmining.fetch import Fetcher, RateLimiter
+from enbmining.metrics import FetchMetrics
 
 
 def load_csv(input_path):
@@ -24,44 +16,64 @@ def load_csv(input_path):
         ]
 
 
-def save_html(content, path):
-    with open(path, 'w') as f:
-        f.write(content)
-
+def main(
+    issues_path,
+    html_folder,
+    workers=4,
+    retries=3,
+    min_interval=1.0,
+    timeout=10,
+    pack=False,
+    trim=False,
+    metrics_path=None,
+    debug=False,
+):
+    issues = load_csv(issues_path)
+    if pack:
+        # Compress the pages downloaded as loose HTML files.
+        HTMLCorpus(html_folder).pack()
+    # Record the fetches in the HTML folder by default.
+    if metrics_path is None:
+        metrics_path = Path(html_folder) / 'fetches.jsonl'
+    fetcher = Fetcher(
+        browsers=workers,
+        timeout=timeout,
+        limiter=RateLimiter(workers, min_interval),
+        metrics=FetchMetrics(metrics_path),
+    )
+    downloader = Downloader(
+        html_folder,
+        fetcher,
+        workers=workers,
+        retries=retries,
+        trim=trim,
+        debug=debug,
+    )
 
-def fetch_html_with_selenium(url):
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
     try:
-        driver.get(url)
-        import time
-        time.sleep(2)
-        return driver.page_source
+        summary = downloader.download(issues)
     finally:
-        driver.quit()
-
-
-def main(issues_path, html_folder, debug=False):
-    issues = load_csv(issues_path)
-
-    for issue in issues:
-        path = str(html_folder / Path(issue['id'] + '.html'))
-        if os.path.exists(path):
-            continue
-
-        if debug:
-            print(f'Downloading issue {issue["id"]}')
-
-        time.sleep(random.uniform(0, 2))
-        url = issue['url']
-        html = fetch_html_with_selenium(url)
-        save_html(html, path)
+        fetcher.close()
+
+    print(f'{summary["ok"]} issues downloaded, {summary["failed"]} failed')
+    failed = downloader.failed()
+    if len(failed) > 0:
+        print(f'Failed issues: {", ".join(failed)}')
+    tiers = fetcher.tier_counts()
+    print(
+        f'Fetched {tiers["http"]} issues over HTTP and {tiers["browser"]}'
+        ' issues with a browser'
+    )
+    timeouts = fetcher.drivers.timeouts
+    if len(timeouts) > 0:
+        print(f'{len(timeouts)} issues timed out after {timeout}s:')
+        for url in timeouts:
+            print(f'  {url}')
+    trim_errors = downloader.trim_errors
+    if len(trim_errors) > 0:
+        print(f'{len(trim_errors)} issues could not be trimmed:')
+        for issue_id, error in trim_errors.items():
+            print(f'  {issue_id}: {error}')
 
 
 if __name__ == '__main__':
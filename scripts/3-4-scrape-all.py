@@ -0,0 +1,67 @@
+import fire
+from enbmining import Interaction, Intervention, IssueScraper
+from enbmining.nlp import memo_summary
+from enbmining.parallel import scrape_issues
+from enbmining.utils import load_csv, print_progress
+
+
+def main(
+    html_folder,
+    issues_path,
+    parties_path,
+    groupings_path,
+    interventions_path,
+    interactions_path,
+    sentences_folder=None,
+    workers=1,
+    parser='bs4',
+    cache_folder=None,
+    tagger='perceptron',
+):
+
+    issues = load_csv(issues_path)
+
+    # Filter out empty issues
+    issues = [issue for issue in issues if issue.get('id') and issue['id'].strip()]
+
+    # Scrape the issues in `workers` processes, parsing the tagged sentences
+    # stored by tag-sentences.py, if any. With a cache folder, the issues that
+    # did not change since the previous run are not scraped again.
+    stats = dict()
+    scraped = scrape_issues(
+        IssueScraper,
+        issues,
+        html_folder,
+        parties_path,
+        groupings_path,
+        sentences_folder,
+        workers,
+        parser,
+        cache_folder,
+        tagger,
+        stats,
+    )
+
+    # Extract interventions and interactions, parsing and tagging each issue
+    # only once, and writing them as they are found. Duplicated interventions
+    # are eliminated on the way (as in 3-scrape-interventions.py).
+    print('Extracting interventions and interactions...')
+    with Intervention.writer(
+        interventions_path, unique=True
+    ) as interventions, Interaction.writer(interactions_path) as interactions:
+        for i, issue_data in enumerate(scraped):
+            for sentence_interventions, sentence_interactions in issue_data:
+                interventions.write(sentence_interventions)
+                interactions.write(sentence_interactions)
+            print_progress(i, issues, every_n=10)
+
+    print(f'Extracted {interventions.total} interventions from {len(issues)} issues')
+    print(f'Eliminated {interventions.duplicates} duplicated interventions')
+    print(f'Extracted {interventions.written} unique interventions from {len(issues)} issues')
+    print(f'Extracted {interactions.total} interactions from {len(issues)} issues')
+    memo = memo_summary(stats['memo_hits'], stats['memo_misses'])
+    print(f'Tagging memo: {memo}')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
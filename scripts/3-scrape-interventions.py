@@ -1,50 +1,59 @@
 import fire
-import pandas as pd
 from enbmining import Intervention, InterventionScraper
-from enbmining.entities import Grouping, Party
-from enbmining.utils import load_csv, load_html, print_progress
+from enbmining.nlp import memo_summary
+from enbmining.parallel import scrape_issues
+from enbmining.utils import load_csv, print_progress
+
+
+def main(
+    html_folder,
+    issues_path,
+    parties_path,
+    groupings_path,
+    output_path,
+    sentences_folder=None,
+    workers=1,
+    parser='bs4',
+    cache_folder=None,
+    tagger='perceptron',
+):
 
-
-def main(html_folder, issues_path, parties_path, groupings_path, output_path):
-
-    parties = Party.load(parties_path)
-    groupings = Grouping.load(groupings_path)
     issues = load_csv(issues_path)
     
     # Filter out empty issues
     issues = [issue for issue in issues if issue.get('id') and issue['id'].strip()]
 
-    # Extract interventions.
+    # Scrape the issues in `workers` processes, parsing the tagged sentences
+    # stored by tag-sentences.py, if any. With a cache folder, the issues that
+    # did not change since the previous run are not scraped again.
+    stats = dict()
+    scraped = scrape_issues(
+        InterventionScraper,
+        issues,
+        html_folder,
+        parties_path,
+        groupings_path,
+        sentences_folder,
+        workers,
+        parser,
+        cache_folder,
+        tagger,
+        stats,
+    )
+
+    # Extract interventions, writing them as they are found and eliminating
+    # duplicated interventions on the way.
     print('Extracting interventions...')
-    interventions = list()
-    for i, issue in enumerate(issues):
-        html = load_html(html_folder, issue['id'])
-        scraper = InterventionScraper(html, issue, parties, groupings)
-        # Keep only unique interventions. Problem with this method: the order of interventions is not preserved.
-        # interventions.extend(set(scraper.scrape()))
-        # Keep interventions sorted, but with some repetitions possible.
-        interventions.extend(scraper.scrape())
-        print_progress(i, issues, every_n=10)
-
-    total = len(interventions)
-    print(f'Extracted {total} interventions from {len(issues)} issues')
-
-    # Save interventions.
-    Intervention.to_csv(interventions, output_path)
-
-    # Read interventions as df.
-    df_interventions = pd.read_csv(output_path)
-    print(df_interventions.head())
-
-    # Eliminate duplicated interventions.
-    df_interventions = df_interventions.drop_duplicates(subset=['issue_id', 'entity', 'date', 'sentence'])
-
-    total2 = len(df_interventions)
-    print(f'Eliminated {total - total2} duplicated interventions')
-    print(f'Extracted {total2} unique interventions from {len(issues)} issues')
-
-    # Save interventions.
-    df_interventions.to_csv(output_path, index=False)
+    with Intervention.writer(output_path, unique=True) as writer:
+        for i, issue_data in enumerate(scraped):
+            writer.write(issue_data)
+            print_progress(i, issues, every_n=10)
+
+    print(f'Extracted {writer.total} interventions from {len(issues)} issues')
+    print(f'Eliminated {writer.duplicates} duplicated interventions')
+    print(f'Extracted {writer.written} unique interventions from {len(issues)} issues')
+    memo = memo_summary(stats['memo_hits'], stats['memo_misses'])
+    print(f'Tagging memo: {memo}')
 
 
 if __name__ == '__main__':
@@ -1,31 +1,55 @@
 import fire
 from enbmining import Interaction, InteractionScraper
-from enbmining.entities import Grouping, Party
-from enbmining.utils import load_csv, load_html, print_progress
+from enbmining.nlp import memo_summary
+from enbmining.parallel import scrape_issues
+from enbmining.utils import load_csv, print_progress
 
 
-def main(html_folder, issues_path, parties_path, groupings_path, output_path):
+def main(
+    html_folder,
+    issues_path,
+    parties_path,
+    groupings_path,
+    output_path,
+    sentences_folder=None,
+    workers=1,
+    parser='bs4',
+    cache_folder=None,
+    tagger='perceptron',
+):
 
-    parties = Party.load(parties_path)
-    groupings = Grouping.load(groupings_path)
     issues = load_csv(issues_path)
     
     # Filter out empty issues
     issues = [issue for issue in issues if issue.get('id') and issue['id'].strip()]
 
-    # Extract interactions
-    print('Extracting interactions...')
-    interactions = list()
-    for i, issue in enumerate(issues):
-        html = load_html(html_folder, issue['id'])
-        scraper = InteractionScraper(html, issue, parties, groupings)
-        interactions.extend(scraper.scrape())
-        print_progress(i, issues, every_n=10)
-    total = len(interactions)
-    print(f'Extracted {total} interactions from {len(issues)} issues')
+    # Scrape the issues in `workers` processes, parsing the tagged sentences
+    # stored by tag-sentences.py, if any. With a cache folder, the issues that
+    # did not change since the previous run are not scraped again.
+    stats = dict()
+    scraped = scrape_issues(
+        InteractionScraper,
+        issues,
+        html_folder,
+        parties_path,
+        groupings_path,
+        sentences_folder,
+        workers,
+        parser,
+        cache_folder,
+        tagger,
+        stats,
+    )
 
-    # Save interactions.
-    Interaction.to_csv(interactions, output_path)
+    # Extract interactions, writing them as they are found.
+    print('Extracting interactions...')
+    with Interaction.writer(output_path) as writer:
+        for i, issue_data in enumerate(scraped):
+            writer.write(issue_data)
+            print_progress(i, issues, every_n=10)
+    print(f'Extracted {writer.total} interactions from {len(issues)} issues')
+    memo = memo_summary(stats['memo_hits'], stats['memo_misses'])
+    print(f'Tagging memo: {memo}')
 
 
 if __name__ == '__main__':
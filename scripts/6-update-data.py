@@ -3,16 +3,21 @@
 Incremental updater for ENB data.
 
 Workflow:
-1) Read existing data/issues.csv and fetch the first two pages of UNFCCC issues from ENB
+1) Read existing data/issues.csv and fetch the UNFCCC issues from ENB, stopping at the first meeting
+   already in data/issues.csv
 2) Identify new meetings (by meeting name) and assign IDs starting from last existing id + 1
-3) Save these as data/new_issues.csv
-4) Download HTML for the new issues to data/html_new/ using scripts/2-download-html.py
-5) Scrape interventions/interactions from those HTML files using existing scripts 3 and 4, producing
-   data/interventions_new.csv and data/interactions_new.csv
-6) Append the new rows to the main CSVs (issues.csv, interventions.csv, interactions.csv)
-7) Clean up the temporary CSV files
+3) Write all the issues, with these appended, to a temporary copy of data/issues.csv
+4) Download HTML for the new issues to data/html/ using scripts/2-download-html.py (the issues
+   already downloaded are skipped)
+5) Scrape interventions/interactions from all HTML files in one pass using scripts/3-4-scrape-all.py,
+   rewriting data/interventions.csv and data/interactions.csv. The issues scraped by a previous run
+   are served from the scrape cache (data/scrape-cache), so only the new issues are processed, unless
+   the lists of entities or the rules changed.
+6) Replace data/issues.csv with the temporary copy, only once both steps succeeded, so that a
+   failed run is retried in full by the next one
 """
 
+import os
 import subprocess
 from pathlib import Path
 
@@ -20,14 +25,23 @@ import pandas as pd
 from enbmining import Client
 
 
-def fetch_new_issues(existing_issues_path: Path, start_page: int = 1, end_page: int = 2):
+def fetch_new_issues(
+    existing_issues_path: Path,
+    start_page: int = 1,
+    end_page: int = 9,
+    cache_folder: str = None,
+):
     """Fetch issues from ENB and return those with meetings not already present."""
     existing_df = pd.read_csv(existing_issues_path)
     existing_meetings = set(existing_df['meeting'].dropna())
     last_id = int(existing_df['id'].max()) if len(existing_df) else 0
 
-    client = Client(negotiation='UNFCCC')
-    all_issues = client.get_issues_metadata(start_page=start_page, end_page=end_page)
+    with Client(negotiation='UNFCCC', cache_folder=cache_folder) as client:
+        all_issues = client.get_issues_metadata(
+            start_page=start_page,
+            end_page=end_page,
+            known_meetings=existing_meetings,
+        )
 
     cols = list(existing_df.columns)
     new_issues = []
@@ -49,87 +63,62 @@ def run_script(script_path: Path, args: list[str]):
     subprocess.check_call(['python3', str(script_path), *args])
 
 
-def append_with_new_ids(existing_path: Path, new_path: Path):
-    """Append new rows assigning fresh ids after the current max."""
-    if not new_path.exists():
-        return
-    new_df = pd.read_csv(new_path)
-    if new_df.empty:
-        return
-
-    existing_df = pd.read_csv(existing_path)
-    max_id = int(existing_df['id'].max()) if len(existing_df) else 0
-    new_df['id'] = range(max_id + 1, max_id + 1 + len(new_df))
-
-    combined = pd.concat([existing_df, new_df], ignore_index=True)
-    combined.to_csv(existing_path, index=False)
-
-
 def main(
     issues_path: str = 'data/issues.csv',
     parties_path: str = 'data/parties.txt',
     groupings_path: str = 'data/groupings.txt',
-    html_new_folder: str = 'data/html_new',
+    html_folder: str = 'data/html',
+    interventions_path: str = 'data/interventions.csv',
+    interactions_path: str = 'data/interactions.csv',
     start_page: int = 1,
-    end_page: int = 2,
+    end_page: int = 9,
+    cache_folder: str = 'data/cache',
+    scrape_cache_folder: str = 'data/scrape-cache',
     debug: bool = False,
 ):
     issues_path = Path(issues_path)
-    parties_path = Path(parties_path)
-    groupings_path = Path(groupings_path)
-    html_new_folder = Path(html_new_folder)
-
-    tmp_new_issues = Path('data/new_issues.csv')
-    tmp_interventions = Path('data/interventions_new.csv')
-    tmp_interactions = Path('data/interactions_new.csv')
 
     print('Fetching issues from ENB...')
-    new_issues, cols = fetch_new_issues(issues_path, start_page, end_page)
+    new_issues, cols = fetch_new_issues(
+        issues_path, start_page, end_page, cache_folder
+    )
     if not new_issues:
         print('No new issues found. Exiting.')
         return
 
-    # Save new issues with assigned IDs
-    pd.DataFrame(new_issues, columns=cols).to_csv(tmp_new_issues, index=False)
-    print(f'Found {len(new_issues)} new issues. Saved to {tmp_new_issues}.')
-
-    # Ensure output folder for new HTML
-    html_new_folder.mkdir(parents=True, exist_ok=True)
+    # 1) Append the new issues with assigned IDs to a copy of issues.csv, which
+    # replaces it only once the new issues are downloaded and scraped (else
+    # the next run would take them as known and never process them).
+    print(f'Found {len(new_issues)} new issues.')
+    existing_issues = pd.read_csv(issues_path)
+    new_issues_df = pd.DataFrame(new_issues, columns=cols)
+    updated_issues_path = issues_path.with_name(f'{issues_path.name}.new')
+    pd.concat([existing_issues, new_issues_df], ignore_index=True).to_csv(updated_issues_path, index=False)
 
-    # 1) Download HTML for new issues
+    # 2) Download HTML for new issues
     print('Downloading HTML for new issues...')
-    run_script(Path('scripts/2-download-html.py'), [str(tmp_new_issues), str(html_new_folder)] + ([] if not debug else ['--debug']))
-
-    # 2) Scrape interventions
-    print('Scraping interventions for new issues...')
-    run_script(
-        Path('scripts/3-scrape-interventions.py'),
-        [str(html_new_folder), str(tmp_new_issues), str(parties_path), str(groupings_path), str(tmp_interventions)],
-    )
+    run_script(Path('scripts/2-download-html.py'), [str(updated_issues_path), str(html_folder)] + ([] if not debug else ['--debug']))
 
-    # 3) Scrape interactions
-    print('Scraping interactions for new issues...')
+    # 3) Scrape interventions and interactions, from the cache for the issues
+    # that were already scraped
+    print('Scraping interventions and interactions for new issues...')
     run_script(
-        Path('scripts/4-scrape-interactions.py'),
-        [str(html_new_folder), str(tmp_new_issues), str(parties_path), str(groupings_path), str(tmp_interactions)],
+        Path('scripts/3-4-scrape-all.py'),
+        [
+            str(html_folder),
+            str(updated_issues_path),
+            str(parties_path),
+            str(groupings_path),
+            str(interventions_path),
+            str(interactions_path),
+            '--cache_folder',
+            str(scrape_cache_folder),
+        ],
     )
 
-    # 4) Append to main CSVs
-    print('Appending new issues to issues.csv...')
-    existing_issues = pd.read_csv(issues_path)
-    new_issues_df = pd.read_csv(tmp_new_issues)
-    pd.concat([existing_issues, new_issues_df], ignore_index=True).to_csv(issues_path, index=False)
-
-    print('Appending new interventions...')
-    append_with_new_ids(Path('data/interventions.csv'), tmp_interventions)
-
-    print('Appending new interactions...')
-    append_with_new_ids(Path('data/interactions.csv'), tmp_interactions)
-
-    # 5) Cleanup temp files
-    for tmp in [tmp_new_issues, tmp_interventions, tmp_interactions]:
-        if tmp.exists():
-            tmp.unlink()
+    # 4) Record the new issues as processed
+    print(f'Appending the new issues to {issues_path}...')
+    os.replace(updated_issues_path, issues_path)
     print('Done.')
 
 
@@ -0,0 +1,323 @@
+import re
+import time
+
+import fire
+import nltk
+from bs4 import BeautifulSoup
+from enbmining.corpus import HTMLCorpus
+from enbmining.documents import (
+    OPINIONS,
+    REPORT_CLASS,
+    SoupDocument,
+    extract_old_html_content,
+    find_heading_tags,
+    get_paragraphs,
+    is_opinion_text,
+)
+from enbmining.entities import Grouping, Party
+from enbmining.nlp import NLPContext, POSTagger
+from enbmining.scraper import ADDITIONAL_HEADINGS, Scraper
+
+
+def load_paragraphs(html_folder, limit=None):
+    """Parses the stored issues and returns their paragraphs."""
+    corpus = HTMLCorpus(html_folder)
+    paragraphs = list()
+    for issue_id in corpus.ids()[:limit]:
+        soup = BeautifulSoup(corpus.read(issue_id, prefer_report=True), 'lxml')
+        content = soup.find('section', class_=REPORT_CLASS)
+        if content is None:
+            content = extract_old_html_content(soup)
+        paragraphs.extend(paragraph for paragraph, _ in get_paragraphs(content))
+    return paragraphs
+
+
+def find_heading_tags_with_lookups(paragraph):
+    """Finds the heading tags of a paragraph the way extract_sentences used
+    to, with one subtree walk per kind of tag."""
+    found = dict()
+    for name in ['h2', 'h3', 'h4']:
+        heading = paragraph.find([name])
+        if heading:
+            found[name] = heading
+    strong_em = next(
+        iter(
+            paragraph.find_all(
+                lambda tag: tag.name == 'strong' and tag.find('em')
+            )
+        ),
+        None,
+    )
+    if strong_em:
+        found['strong_em'] = strong_em
+    strong = next(
+        iter(
+            paragraph.find_all(
+                lambda tag: tag.name == 'strong' and not tag.find('em')
+            )
+        ),
+        None,
+    )
+    if strong:
+        found['strong'] = strong
+    # The list of additional headings used to be built for each paragraph.
+    list(ADDITIONAL_HEADINGS)
+    return found
+
+
+def normalize_with_subs(text):
+    """Normalizes a paragraph the way Scraper._normalize used to, with one
+    re.sub call per rule."""
+    text = re.sub(r'a\.m\.', r'am', text)
+    text = re.sub(r'p\.m\.', r'pm', text)
+    text = re.sub(r'Amb\.', r'Amb', text)
+    text = re.sub(r'(and)([A-Z])', r'\1 \2', text)
+    text = re.sub(r'77and', r'77 and', text)
+    text = re.sub(r'([A-Z][A-Z])(and)', r'\1 \2', text)
+    text = re.sub(r'([A-Z][A-Z])(said)', r'\1 \2', text)
+    text = re.sub(r'(by)([A-Z])', r'\1 \2', text)
+    text = re.sub(r'(AUSTRALIA)(endorsed)', r'\1 \2', text)
+    text = re.sub(r'(AUSTRALIA)(said)', r'\1 \2', text)
+    text = re.sub(r'(Australia)(said)', r'\1 \2', text)
+    text = re.sub(r'(EU)(highlighted)', r'\1 \2', text)
+    text = re.sub(r'(\w)\(', r'\1 (', text)
+    text = re.sub(r'\.([A-Z])', r'. \1', text)
+    text = re.sub(r'\r', ' ', text)
+    text = re.sub(r'\n', ' ', text)
+    text = re.sub(r'\xa0+', ' ', text, flags=re.UNICODE)
+    text = re.sub(r'\s\s+', ' ', text)
+    return text
+
+
+def preprocess_with_subs(text):
+    """Preprocesses a sentence the way Scraper._preprocess used to."""
+    text = re.sub(r'(Climate Justice Now)!', r'\1', text)
+    text = re.sub(r'(CLIMATE JUSTICE NOW)!', r'\1', text)
+    text = re.sub(r'(CJN)!', r'\1', text)
+    text = re.sub(r'(ACT)!', r'\1', text)
+    text = re.sub(r'US\$', '$', text)
+    text = re.sub(r'QELRO[Ss]', 'qelros', text)
+    return text
+
+
+def is_opinion_text_with_scans(text):
+    """Detects opinion sections the way is_opinion_text used to, with one
+    substring scan per marker."""
+    return any([opinion in text for opinion in OPINIONS])
+
+
+def old_report_with_scans(soup):
+    """Extracts the paragraphs of an old page the way SoupDocument used to,
+    scanning the paragraphs twice to find the report and moving them to a
+    new tag."""
+    all_paragraphs = soup.find_all('p')
+    if not all_paragraphs:
+        return []
+    start_idx = 0
+    for i, p in enumerate(all_paragraphs):
+        text = p.get_text().strip()
+        if re.search(r'\d{1,2}\s*-\s*\d{1,2}\s+\w+\s+\d{4}', text) or \
+           'SUBSIDIARY BODIES' in text.upper() or \
+           'FRAMEWORK CONVENTION' in text.upper():
+            start_idx = i
+            break
+    end_idx = len(all_paragraphs)
+    for i in range(start_idx, len(all_paragraphs)):
+        text = all_paragraphs[i].get_text().strip()
+        if 'THINGS TO LOOK FOR' in text.upper() or 'IN THE CORRIDORS' in text.upper():
+            end_idx = i
+            break
+    wrapper = soup.new_tag('div')
+    for p in all_paragraphs[start_idx:end_idx]:
+        wrapper.append(p)
+    paragraphs = list()
+    for paragraph, text in get_paragraphs(wrapper):
+        found = find_heading_tags(paragraph)
+        headings = {name: tag.get_text() for name, tag in found.items()}
+        paragraphs.append((paragraph.name, text, headings))
+    return paragraphs
+
+
+def old_report_in_one_pass(soup):
+    document = SoupDocument.__new__(SoupDocument)
+    document.soup = soup
+    return list(document.paragraphs())
+
+
+def load_sentences(html_folder, nlp, limit=None):
+    """Extracts the preprocessed sentences of the stored issues, as they are
+    tagged."""
+    corpus = HTMLCorpus(html_folder)
+    tokenizer = nlp.sentence_tokenizer
+    sentences = list()
+    for issue_id in corpus.ids()[:limit]:
+        html = corpus.read(issue_id, prefer_report=True)
+        scraper = Scraper(html, None, [], [], nlp=nlp)
+        for _, _, text in scraper._headed_paragraphs():
+            sentences.extend(
+                scraper._preprocess(sentence)
+                for sentence in tokenizer.tokenize(text)
+            )
+    return sentences
+
+
+def tag_with_pos_tag(pos_tagger, sentence):
+    """Tags a sentence the way POSTagger.tag used to, with nltk.pos_tag,
+    which loads the model of its tagger on each call."""
+    tagged = nltk.pos_tag(pos_tagger.tokenizer.tokenize(sentence))
+    return pos_tagger._retag_with_model(tagged)
+
+
+def timed(func, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(item) for item in items]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def headings(html_folder, limit=None, repeat=3):
+    """Compares the single-pass heading classification of paragraphs with
+    the previous per-tag lookups on the stored issues."""
+    paragraphs = load_paragraphs(html_folder, limit)
+    before, expected = timed(find_heading_tags_with_lookups, paragraphs, repeat)
+    after, found = timed(find_heading_tags, paragraphs, repeat)
+    mismatches = sum(
+        {k: id(v) for k, v in a.items()} != {k: id(v) for k, v in b.items()}
+        for a, b in zip(expected, found)
+    )
+    print(f'{len(paragraphs)} paragraphs, {mismatches} mismatches')
+    print(f'Lookups:     {before:.3f}s')
+    print(f'Single pass: {after:.3f}s ({before / after:.1f}x faster)')
+
+
+
+def normalize(html_folder, limit=None, repeat=3):
+    """Compares the precompiled normalization and preprocessing rules with
+    the previous re.sub calls on the text of the stored paragraphs."""
+    texts = [paragraph.get_text() for paragraph in load_paragraphs(html_folder, limit)]
+    scraper = Scraper.__new__(Scraper)
+    for name, before_func, after_func in [
+        ('Normalize', normalize_with_subs, scraper._normalize),
+        ('Preprocess', preprocess_with_subs, scraper._preprocess),
+    ]:
+        before, expected = timed(before_func, texts, repeat)
+        after, found = timed(after_func, texts, repeat)
+        mismatches = sum(a != b for a, b in zip(expected, found))
+        print(f'{name}: {len(texts)} paragraphs, {mismatches} mismatches')
+        print(f'  re.sub calls: {before:.3f}s')
+        print(f'  Rule table:   {after:.3f}s ({before / after:.1f}x faster)')
+
+
+def opinions(html_folder, limit=None, repeat=3):
+    """Compares the detection of opinion sections with a combined regex with
+    the previous substring scans on the text of the stored paragraphs."""
+    texts = [paragraph.get_text() for paragraph in load_paragraphs(html_folder, limit)]
+    before, expected = timed(is_opinion_text_with_scans, texts, repeat)
+    after, found = timed(is_opinion_text, texts, repeat)
+    mismatches = sum(a != b for a, b in zip(expected, found))
+    print(f'{len(texts)} paragraphs, {mismatches} mismatches')
+    print(f'Substring scans: {before:.3f}s')
+    print(f'Combined regex:  {after:.3f}s ({before / after:.1f}x faster)')
+
+
+def legacy(html_folder, limit=None, repeat=3):
+    """Compares the single-pass extraction of the report of old pages with
+    the previous two scans on the stored pages without a report section."""
+    corpus = HTMLCorpus(html_folder)
+    pages = list()
+    for issue_id in corpus.ids()[:limit]:
+        html = corpus.read(issue_id, prefer_report=True)
+        if REPORT_CLASS not in html:
+            pages.append(html)
+    timings = dict()
+    results = dict()
+    for name, func in [
+        ('Two scans', old_report_with_scans),
+        ('One pass', old_report_in_one_pass),
+    ]:
+        timings[name] = float('inf')
+        for _ in range(repeat):
+            # The previous extraction modifies the soups.
+            soups = [BeautifulSoup(html, 'lxml') for html in pages]
+            best, results[name] = timed(func, soups, 1)
+            timings[name] = min(timings[name], best)
+    mismatches = sum(
+        a != b for a, b in zip(results['Two scans'], results['One pass'])
+    )
+    print(f'{len(pages)} old pages, {mismatches} mismatches')
+    print(f'Two scans: {timings["Two scans"]:.3f}s')
+    print(
+        f'One pass:  {timings["One pass"]:.3f}s'
+        f' ({timings["Two scans"] / timings["One pass"]:.1f}x faster)'
+    )
+
+
+def tagging(html_folder, parties_path, groupings_path, limit=None):
+    """Compares the tagging of the sentences of the stored issues with the
+    shared perceptron tagger, in batches, with the previous nltk.pos_tag
+    calls."""
+    parties = Party.load(parties_path)
+    groupings = Grouping.load(groupings_path)
+    sentences = load_sentences(html_folder, NLPContext(parties, groupings), limit)
+    pos_tagger = POSTagger(
+        [party.name for party in parties],
+        [group.name for group in groupings],
+        memo_size=0,
+    )
+    start = time.perf_counter()
+    expected = [tag_with_pos_tag(pos_tagger, sentence) for sentence in sentences]
+    before = time.perf_counter() - start
+    start = time.perf_counter()
+    found = pos_tagger.tag_sents(sentences)
+    after = time.perf_counter() - start
+    mismatches = sum(a != b for a, b in zip(expected, found))
+    print(f'{len(sentences)} sentences, {mismatches} mismatches')
+    print(f'nltk.pos_tag:   {len(sentences) / before:.0f} sentences/s')
+    print(
+        f'Shared tagger:  {len(sentences) / after:.0f} sentences/s'
+        f' ({before / after:.1f}x faster)'
+    )
+
+
+def memo(html_folder, parties_path, groupings_path, limit=None, passes=2):
+    """Compares the tagging of the sentences of the stored issues with and
+    without the memo of tagged sentences, over a number of passes (such as
+    the intervention and interaction passes of scripts 3 and 4)."""
+    parties = Party.load(parties_path)
+    groupings = Grouping.load(groupings_path)
+    sentences = load_sentences(html_folder, NLPContext(parties, groupings), limit)
+    names = (
+        [party.name for party in parties],
+        [group.name for group in groupings],
+    )
+    timings = dict()
+    results = dict()
+    for name, options in [('No memo', {'memo_size': 0}), ('Memo', {})]:
+        pos_tagger = POSTagger(*names, **options)
+        start = time.perf_counter()
+        for _ in range(passes):
+            results[name] = pos_tagger.tag_sents(sentences)
+        timings[name] = time.perf_counter() - start
+    mismatches = sum(a != b for a, b in zip(results['No memo'], results['Memo']))
+    print(f'{len(sentences)} sentences, {passes} passes, {mismatches} mismatches')
+    print(f'Memo: {pos_tagger.memo}')
+    print(f'No memo: {timings["No memo"]:.3f}s')
+    print(
+        f'Memo:    {timings["Memo"]:.3f}s'
+        f' ({timings["No memo"] / timings["Memo"]:.1f}x faster)'
+    )
+
+
+if __name__ == '__main__':
+    fire.Fire(
+        {
+            'headings': headings,
+            'legacy': legacy,
+            'memo': memo,
+            'normalize': normalize,
+            'opinions': opinions,
+            'tagging': tagging,
+        }
+    )
@@ -0,0 +1,149 @@
+import time
+from collections import Counter
+
+import fire
+from enbmining.corpus import HTMLCorpus
+from enbmining.entities import Grouping, Party
+from enbmining.nlp import NLPContext
+from enbmining.parsers import ENTITY
+from enbmining.scraper import IssueScraper, Scraper
+
+
+def headed_paragraphs(html, parser, nlp):
+    """Parses an issue and returns its (paragraph, heading, text) stream."""
+    scraper = Scraper(html, None, [], [], nlp=nlp, parser=parser)
+    return list(scraper._headed_paragraphs())
+
+
+def sentence_stream(paragraphs, tokenizer):
+    """Returns the (paragraph, heading, sentence) stream of an issue, as
+    the scraper extracts it before tagging."""
+    return [
+        (paragraph, heading, sentence)
+        for paragraph, heading, text in paragraphs
+        for sentence in tokenizer.tokenize(text)
+    ]
+
+
+def parsers(html_folder, parser='lxml', reference='bs4', limit=None, show=3):
+    """Checks that a parser yields the same sentences and headings as the
+    reference parser on every stored issue."""
+    corpus = HTMLCorpus(html_folder)
+    nlp = NLPContext([], [])
+    timings = {reference: 0, parser: 0}
+    mismatches = list()
+    issue_ids = corpus.ids()[:limit]
+    for issue_id in issue_ids:
+        html = corpus.read(issue_id, prefer_report=True)
+        streams = dict()
+        for name in timings:
+            start = time.perf_counter()
+            paragraphs = headed_paragraphs(html, name, nlp)
+            timings[name] += time.perf_counter() - start
+            streams[name] = sentence_stream(paragraphs, nlp.sentence_tokenizer)
+        if streams[reference] != streams[parser]:
+            mismatches.append(issue_id)
+            if len(mismatches) <= show:
+                diff = next(
+                    (a, b)
+                    for a, b in zip(
+                        streams[reference] + [None], streams[parser] + [None]
+                    )
+                    if a != b
+                )
+                print(f'Issue {issue_id}: first difference')
+                print(f'  {reference}: {diff[0]}')
+                print(f'  {parser}: {diff[1]}')
+    print(f'{len(issue_ids)} issues, {len(mismatches)} mismatches')
+    for name, seconds in timings.items():
+        print(f'{name}: {seconds:.3f}s')
+
+
+def entities(html_folder, parties_path, groupings_path, limit=None, show=3):
+    """Checks that the entity filter keeps every sentence of the stored
+    issues that gets an entity tag, and reports how many it skips."""
+    corpus = HTMLCorpus(html_folder)
+    nlp = NLPContext(Party.load(parties_path), Grouping.load(groupings_path))
+    missed = list()
+    issue_ids = corpus.ids()[:limit]
+    for issue_id in issue_ids:
+        html = corpus.read(issue_id, prefer_report=True)
+        scraper = Scraper(html, None, [], [], nlp=nlp)
+        sentences = scraper.tag_paragraph_sentences(skip_entity_free=False)
+        for _, _, sentence, tagged in sentences:
+            kept = nlp.entity_filter.may_mention(scraper._preprocess(sentence))
+            if not kept and any(tag in ENTITY for _, tag in tagged):
+                missed.append(sentence)
+                if len(missed) <= show:
+                    print(f'Issue {issue_id}: skipped {sentence!r}')
+    print(f'{len(issue_ids)} issues, {nlp.entity_filter}')
+    print(f'{len(missed)} skipped sentences with an entity')
+
+
+def scraped_rows(html, issue, parties, groupings, nlp):
+    """Scrapes an issue and returns the rows of its interventions and of its
+    interactions, as they are written to the CSV files."""
+    scraper = IssueScraper(html, issue, parties, groupings, nlp=nlp)
+    rows = ([], [])
+    for sentence_data in scraper.scrape():
+        for kind_rows, data in zip(rows, sentence_data):
+            kind_rows.extend(
+                tuple(repr(getattr(datum, k)) for k in datum._keys)
+                for datum in data
+            )
+    return rows
+
+
+def taggers(
+    html_folder,
+    parties_path,
+    groupings_path,
+    tagger='rules',
+    reference='perceptron',
+    limit=None,
+    show=3,
+):
+    """Compares the interventions and interactions scraped from the stored
+    issues with a mode of POSTagger with those of the reference mode."""
+    corpus = HTMLCorpus(html_folder)
+    parties = Party.load(parties_path)
+    groupings = Grouping.load(groupings_path)
+    contexts = {
+        name: NLPContext(parties, groupings, name) for name in (reference, tagger)
+    }
+    timings = {name: 0 for name in contexts}
+    kinds = ['interventions', 'interactions']
+    counts = {kind: Counter() for kind in kinds}
+    shown = 0
+    issue_ids = corpus.ids()[:limit]
+    for issue_id in issue_ids:
+        html = corpus.read(issue_id, prefer_report=True)
+        issue = {'id': issue_id, 'issue_date': None}
+        rows = dict()
+        for name, nlp in contexts.items():
+            start = time.perf_counter()
+            rows[name] = scraped_rows(html, issue, parties, groupings, nlp)
+            timings[name] += time.perf_counter() - start
+        for kind, expected, found in zip(kinds, rows[reference], rows[tagger]):
+            expected, found = Counter(expected), Counter(found)
+            counts[kind]['total'] += sum(expected.values())
+            counts[kind]['missing'] += sum((expected - found).values())
+            counts[kind]['extra'] += sum((found - expected).values())
+            for row in (expected - found) | (found - expected):
+                shown += 1
+                if shown <= show:
+                    which = 'missing' if row in expected else 'extra'
+                    print(f'Issue {issue_id}: {which} {kind[:-1]} {row}')
+    print(f'{len(issue_ids)} issues')
+    for kind in kinds:
+        print(
+            f'{kind}: {counts[kind]["total"]} with {reference},'
+            f' {counts[kind]["missing"]} missing and'
+            f' {counts[kind]["extra"]} extra with {tagger}'
+        )
+    for name, seconds in timings.items():
+        print(f'{name}: {seconds:.3f}s')
+
+
+if __name__ == '__main__':
+    fire.Fire({'entities': entities, 'parsers': parsers, 'taggers': taggers})
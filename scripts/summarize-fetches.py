@@ -0,0 +1,42 @@
+import fire
+from enbmining.metrics import load_metrics, summarize
+
+
+def format_seconds(value):
+    return 'n/a' if value is None else f'{value:.2f}s'
+
+
+def main(metrics_path, last=None):
+    """Prints latency, throughput and failure rates of each fetch run."""
+    summaries = summarize(load_metrics(metrics_path))
+    runs = sorted(summaries)
+    if last is not None:
+        runs = runs[-last:]
+    for run in runs:
+        summary = summaries[run]
+        tiers = ', '.join(
+            f'{tier}: {count}' for tier, count in summary['tiers'].items()
+        )
+        print(f'Run {run}')
+        print(f'  {summary["requests"]} requests ({tiers})')
+        print(
+            f'  Throughput: {summary["pages_per_second"]:.2f} pages/s,'
+            f' {summary["megabytes_per_second"]:.2f} MB/s'
+        )
+        print(
+            f'  Duration: p50 {format_seconds(summary["p50_duration"])},'
+            f' p95 {format_seconds(summary["p95_duration"])}'
+        )
+        print(
+            f'  Time to first byte: p50 {format_seconds(summary["p50_ttfb"])},'
+            f' p95 {format_seconds(summary["p95_ttfb"])}'
+        )
+        print(
+            f'  Failures: {summary["failure_rate"]:.1%},'
+            f' timeouts: {summary["timeout_rate"]:.1%},'
+            f' retries: {summary["retries"]}'
+        )
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
@@ -0,0 +1,55 @@
+import fire
+from enbmining.entities import Grouping, Party
+from enbmining.nlp import NLPContext
+from enbmining.scraper import Scraper
+from enbmining.sentences import SentenceCorpus
+from enbmining.utils import load_csv, load_html, print_progress
+
+
+def main(
+    html_folder,
+    issues_path,
+    parties_path,
+    groupings_path,
+    sentences_folder,
+    rebuild=False,
+    parser='bs4',
+    tagger='perceptron',
+):
+    """Extracts and tags the sentences of the issues once, so that scripts 3
+    and 4 can parse them with `--sentences_folder` without re-scraping."""
+
+    parties = Party.load(parties_path)
+    groupings = Grouping.load(groupings_path)
+    issues = load_csv(issues_path)
+
+    # Filter out empty issues
+    issues = [issue for issue in issues if issue.get('id') and issue['id'].strip()]
+
+    sentences = SentenceCorpus(
+        sentences_folder, parties, groupings, parser, tagger
+    )
+    if rebuild:
+        sentences.clear()
+    else:
+        issues = [issue for issue in issues if issue['id'] not in sentences]
+
+    print('Tagging sentences...')
+    nlp = NLPContext(parties, groupings, tagger)
+    total = 0
+    for i, issue in enumerate(issues):
+        html = load_html(html_folder, issue['id'])
+        scraper = Scraper(
+            html, issue, parties, groupings, nlp=nlp, parser=parser
+        )
+        tagged_sentences = list(
+            scraper.tag_paragraph_sentences(skip_entity_free=False)
+        )
+        sentences.write(issue['id'], tagged_sentences)
+        total += len(tagged_sentences)
+        print_progress(i, issues, every_n=10)
+    print(f'Tagged {total} sentences from {len(issues)} issues')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)